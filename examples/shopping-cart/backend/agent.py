@@ -9,6 +9,7 @@ This example demonstrates:
 """
 
 import os
+from functools import lru_cache
 from typing import List, Dict, Any
 from dotenv import load_dotenv
 
@@ -18,6 +19,7 @@ import uvicorn
 
 from agent_state_bridge.fastapi import create_agent_router
 from agent_state_bridge.models import AgentResponse, Message, Action
+from agent_state_bridge.retrieval import ContextRetriever
 
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
@@ -37,15 +39,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize LangChain model
-model = ChatOpenAI(
-    model=os.getenv("LLM_MODEL_ID", "gpt-4o-mini"),
-    api_key=os.getenv("LLM_API_KEY"),
-    base_url=os.getenv("LLM_BASE_URL"),
-    temperature=0.7,
+# Only the products relevant to the latest message go into the prompt
+product_retriever = ContextRetriever(
+    "products",
+    fields=["name", "category"],
+    key="id",
+    top_k=int(os.getenv("PRODUCT_TOP_K", "8")),
 )
 
 
+# Initialize LangChain model on first request, not at import time
+@lru_cache(maxsize=1)
+def get_model() -> ChatOpenAI:
+    """Create the LangChain model once"""
+    return ChatOpenAI(
+        model=os.getenv("LLM_MODEL_ID", "gpt-4o-mini"),
+        api_key=os.getenv("LLM_API_KEY"),
+        base_url=os.getenv("LLM_BASE_URL"),
+        temperature=0.7,
+    )
+
+
 async def shopping_agent(
     messages: List[Message], 
     actions: List[Action], 
@@ -58,7 +72,8 @@ async def shopping_agent(
         messages: Conversation history with user
         actions: Recent CRUD operations on the cart (optional, for context)
         context: Current application state including:
-            - products: Available products catalog
+            - products: Available products catalog (narrowed to the most
+              relevant items before building the prompt)
             - cart: Current cart state (items, total, itemCount)
             - (future) ragResults: Vector search results for RAG
     
@@ -71,7 +86,7 @@ async def shopping_agent(
     
     # Extract context data
     cart_items = context.get('cart', {}).get('items', [])
-    products = context.get('products', [])
+    products = product_retriever.retrieve(messages, context)
     cart_total = context.get('cart', {}).get('total', 0)
     
     # Build cart summary for system prompt
@@ -98,7 +113,7 @@ CURRENT CART STATE:
 Total items: {len(cart_items)}
 Total price: ${cart_total:.2f}
 
-AVAILABLE PRODUCTS:
+RELEVANT PRODUCTS:
 {chr(10).join([f"- {p['name']} ({p.get('category', 'N/A')}) - ${p.get('price', 0):.2f}" for p in products])}
 {actions_context}
 
@@ -130,7 +145,7 @@ GUIDELINES:
             lc_messages.append(AIMessage(content=msg.content))
     
     # Get AI response
-    response = await model.ainvoke(lc_messages)
+    response = await get_model().ainvoke(lc_messages)
     response_text = response.content or "I'm here to help with your shopping!"
     
     # Future enhancement: Parse response or use function calling to detect desired actions
@@ -20,6 +20,7 @@ export const useShoppingAgentChat = () => {
     // This is where you could add vector search results
     getContext: () => ({
       products: productsData.map(p => ({ 
+        id: p.id,
         name: p.name, 
         category: p.category, 
         price: p.price 
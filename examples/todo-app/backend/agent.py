@@ -9,6 +9,8 @@ This example demonstrates:
 """
 
 import os
+import re
+from functools import lru_cache
 from typing import List, Dict, Any
 from dotenv import load_dotenv
 
@@ -16,7 +18,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
+from agent_state_bridge.actions import ActionCompactor, cancel_out
 from agent_state_bridge.fastapi import create_agent_router
+from agent_state_bridge.intents import IntentRouter
 from agent_state_bridge.models import AgentResponse, Message, Action
 
 from langchain_openai import ChatOpenAI
@@ -37,13 +41,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize LangChain model
-model = ChatOpenAI(
-    model=os.getenv("LLM_MODEL_ID", "gpt-4o-mini"),
-    api_key=os.getenv("LLM_API_KEY"),
-    base_url=os.getenv("LLM_BASE_URL"),
-    temperature=0.7,
-)
+# Initialize LangChain model on first request, not at import time
+@lru_cache(maxsize=1)
+def get_model() -> ChatOpenAI:
+    """Create the LangChain model once"""
+    return ChatOpenAI(
+        model=os.getenv("LLM_MODEL_ID", "gpt-4o-mini"),
+        api_key=os.getenv("LLM_API_KEY"),
+        base_url=os.getenv("LLM_BASE_URL"),
+        temperature=0.7,
+    )
 
 
 async def todo_agent(
@@ -197,7 +204,7 @@ GUIDELINES:
             lc_messages.append(AIMessage(content=msg.content))
     
     # Bind tools to model
-    model_with_tools = model.bind_tools(tools)
+    model_with_tools = get_model().bind_tools(tools)
     
     # Get AI response
     response = await model_with_tools.ainvoke(lc_messages)
@@ -263,10 +270,62 @@ GUIDELINES:
     )
 
 
+# Fast path: trivially structured commands are answered without the LLM
+intents = IntentRouter()
+
+
+def _find_task(context: Dict[str, Any], task_id: int):
+    return next((t for t in context.get('todos', []) if t['id'] == task_id), None)
+
+
+@intents.intent(r"(?:delete|remove) task #?(?P<id>\d+)")
+def delete_task_intent(slots, messages, actions, context):
+    task = _find_task(context, int(slots['id']))
+    if not task:
+        return None  # Unknown ID: let the LLM explain
+    return AgentResponse(
+        response=f'✅ **Eliminada la tarea "{task["text"]}"**',
+        actions=[Action(type='delete', payload={'id': task['id']})],
+    )
+
+
+@intents.intent(r"mark (?:task )?#?(?P<id>\d+) (?:as )?(?P<status>done|undone|pending)")
+def toggle_task_intent(slots, messages, actions, context):
+    task = _find_task(context, int(slots['id']))
+    want_done = slots['status'].lower() == 'done'
+    if not task or task.get('done', False) == want_done:
+        return None  # Unknown ID or nothing to change
+    status = "Completada" if want_done else "Marcada como pendiente"
+    return AgentResponse(
+        response=f'✅ **{status} la tarea "{task["text"]}"**',
+        actions=[Action(type='put', payload={'id': task['id']})],
+    )
+
+
+# Only "add task <text>" with a single item; lists ("add task milk, eggs")
+# and edits of existing tasks ("add task due date to task 3") go to the LLM
+@intents.intent(r"add task:? (?P<text>[^,:;]+)")
+def create_task_intent(slots, messages, actions, context):
+    text = slots['text'].strip()
+    if re.search(r"\b(?:to|for|in|on) (?:task )?#?\d+\b", text, re.IGNORECASE):
+        return None
+    return AgentResponse(
+        response=f'✅ **Creada la tarea "{text}"**',
+        actions=[Action(type='post', payload={'text': text})],
+    )
+
+
+# Fold repeated actions on the same task into their net effect.
+# A todo "put" toggles completion, so two toggles cancel each other out.
+compactor = ActionCompactor(key_fields=("id",))
+compactor.rule("put", "put", cancel_out)
+
 # Create and register agent router
 router = create_agent_router(
     agent_handler=todo_agent,
-    tags=["todo-agent"]
+    tags=["todo-agent"],
+    compactor=compactor,
+    intents=intents,
 )
 app.include_router(router)
 
@@ -4,6 +4,28 @@ agent-state-bridge: Python backend utilities for sharing app state with AI agent
 
 __version__ = "0.2.0"
 
-from .models import AgentRequest, AgentResponse, Message, Action
+import importlib
+
+# Public names are resolved on first access so that importing the package
+# does not pull in pydantic or any web framework.
+_LAZY_ATTRS = {
+    "AgentRequest": ".models",
+    "AgentResponse": ".models",
+    "Message": ".models",
+    "Action": ".models",
+}
 
 __all__ = ["AgentRequest", "AgentResponse", "Message", "Action"]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
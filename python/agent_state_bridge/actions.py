@@ -0,0 +1,228 @@
+"""Action utilities for agent-state-bridge: log compaction and typed validation"""
+from typing import Annotated, Any, Callable, Dict, Hashable, List, Literal, Optional, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel, Field, TypeAdapter, create_model
+
+from .models import Action, AgentRequest, AgentResponse
+
+MergeRule = Callable[[Action, Action], List[Action]]
+
+
+def _payload_dict(action: Action) -> Dict[str, Any]:
+    payload = action.payload
+    if isinstance(payload, BaseModel):
+        return payload.model_dump()
+    return payload or {}
+
+
+def merge_into_prev(prev: Action, nxt: Action) -> List[Action]:
+    """Keep the earlier action's type with both payloads merged (e.g. post + put -> post)"""
+    merged = {**_payload_dict(prev), **_payload_dict(nxt)}
+    return [type(prev).model_validate({"type": prev.type, "payload": merged})]
+
+
+def keep_next(prev: Action, nxt: Action) -> List[Action]:
+    """Keep only the later action (e.g. put + delete -> delete)"""
+    return [nxt]
+
+
+def cancel_out(prev: Action, nxt: Action) -> List[Action]:
+    """Drop both actions (e.g. post + delete -> nothing)"""
+    return []
+
+
+def keep_both(prev: Action, nxt: Action) -> List[Action]:
+    """Leave both actions in place"""
+    return [prev, nxt]
+
+
+DEFAULT_RULES: Dict[Tuple[str, str], MergeRule] = {
+    ("post", "put"): merge_into_prev,
+    ("put", "put"): merge_into_prev,
+    ("post", "delete"): cancel_out,
+    ("put", "delete"): keep_next,
+}
+
+
+class ActionCompactor:
+    """
+    Fold the action log into its net effect per entity.
+
+    Actions are grouped by an entity key (by default the first of
+    `key_fields` present in the payload). Consecutive actions on the same
+    entity are folded with the merge rule registered for their
+    ``(previous type, next type)`` pair; pairs without a rule are kept as
+    they are. Actions without a key are passed through untouched.
+
+    Default rules:
+    - post + put -> post (payloads merged)
+    - put + put -> put (payloads merged)
+    - post + delete -> nothing
+    - put + delete -> delete
+
+    Example:
+        ```python
+        from agent_state_bridge.actions import ActionCompactor, cancel_out
+
+        compactor = ActionCompactor(key_fields=("id",))
+        # Todo "put" toggles completion, so two toggles cancel out
+        compactor.rule("put", "put", cancel_out)
+
+        router = create_agent_router(todo_agent, compactor=compactor)
+        ```
+    """
+
+    def __init__(
+        self,
+        key_fields: Sequence[str] = ("id",),
+        key: Optional[Callable[[Action], Optional[Hashable]]] = None,
+        rules: Optional[Dict[Tuple[str, str], MergeRule]] = None,
+    ):
+        self.key_fields = tuple(key_fields)
+        self._key = key or self._default_key
+        self._rules: Dict[Tuple[str, str], MergeRule] = dict(DEFAULT_RULES if rules is None else rules)
+
+    def _default_key(self, action: Action) -> Optional[Hashable]:
+        payload = _payload_dict(action)
+        for field in self.key_fields:
+            value = payload.get(field)
+            if value is not None:
+                return value if isinstance(value, Hashable) else None
+        return None
+
+    def rule(self, prev_type: str, next_type: str, fn: Optional[MergeRule] = None):
+        """
+        Register the merge rule for a ``(prev_type, next_type)`` pair.
+
+        The rule receives both actions and returns the list that replaces
+        them (empty to cancel both). Can be used as a decorator.
+        """
+        if fn is None:
+            def decorator(func: MergeRule) -> MergeRule:
+                self._rules[(prev_type, next_type)] = func
+                return func
+            return decorator
+        self._rules[(prev_type, next_type)] = fn
+        return fn
+
+    def compact(self, actions: Optional[Sequence[Action]]) -> List[Action]:
+        """Net effect of `actions`, in order of each entity's first action"""
+        if not actions:
+            return list(actions or [])
+        slots: List[List[Action]] = []
+        by_key: Dict[Hashable, List[Action]] = {}
+        for action in actions:
+            key = self._key(action)
+            if key is None:
+                slots.append([action])
+                continue
+            slot = by_key.get(key)
+            if slot is None:
+                slot = by_key[key] = []
+                slots.append(slot)
+            if not slot:
+                slot.append(action)
+                continue
+            prev = slot.pop()
+            rule = self._rules.get((prev.type, action.type), keep_both)
+            slot.extend(rule(prev, action))
+        return [action for slot in slots for action in slot]
+
+
+class ActionRegistry:
+    """
+    Declared payload models per action ``type``.
+
+    The registry compiles the declared types once into a discriminated
+    union on ``type``, so a whole action list is validated in a single
+    pydantic-core pass and each action comes out as a typed `Action`
+    subclass whose ``payload`` is the declared model. Unregistered types
+    and malformed payloads are rejected.
+
+    Example:
+        ```python
+        from pydantic import BaseModel
+        from agent_state_bridge.actions import ActionRegistry
+
+        class TaskRef(BaseModel):
+            id: int
+
+        class NewTask(BaseModel):
+            text: str
+
+        registry = ActionRegistry()
+        registry.register("post", NewTask)
+        registry.register("put", TaskRef)
+        registry.register("delete", TaskRef)
+
+        # Bad actions in requests get a 422; bad actions returned by the
+        # handler raise a ValidationError
+        router = create_agent_router(todo_agent, registry=registry)
+        ```
+    """
+
+    def __init__(self):
+        self._payloads: Dict[str, Optional[Type[BaseModel]]] = {}
+        self._models: Dict[str, Type[Action]] = {}
+        self._adapter: Optional[TypeAdapter] = None
+        self._request_model: Optional[Type[AgentRequest]] = None
+        self._response_model: Optional[Type[AgentResponse]] = None
+
+    def register(self, action_type: str, payload: Optional[Type[BaseModel]] = None) -> Type[Action]:
+        """Declare the payload model for `action_type` (None for no payload)"""
+        if self._adapter is not None:
+            raise RuntimeError("ActionRegistry is already compiled; register all types first")
+        self._payloads[action_type] = payload
+        model = create_model(
+            f"{''.join(part.capitalize() for part in action_type.replace('-', '_').split('_'))}Action",
+            __base__=Action,
+            type=(Literal[action_type], Field(..., description="Action type")),
+            payload=(payload, Field(...)) if payload is not None else (None, Field(None)),
+        )
+        self._models[action_type] = model
+        return model
+
+    def action_model(self, action_type: str) -> Type[Action]:
+        """Typed `Action` subclass for a registered type"""
+        return self._models[action_type]
+
+    def _union(self):
+        if not self._models:
+            raise ValueError("No action types registered")
+        models = tuple(self._models.values())
+        if len(models) == 1:
+            return models[0]
+        return Annotated[Union[models], Field(discriminator="type")]
+
+    def compile(self) -> TypeAdapter:
+        """Validator for a list of actions (built once, then cached)"""
+        if self._adapter is None:
+            self._adapter = TypeAdapter(List[self._union()])
+        return self._adapter
+
+    def validate(self, actions: Sequence[Union[Action, Dict[str, Any]]]) -> List[Action]:
+        """Typed actions, or a pydantic `ValidationError` for bad ones"""
+        data = [a.model_dump() if isinstance(a, BaseModel) else a for a in actions]
+        return self.compile().validate_python(data)
+
+    def request_model(self) -> Type[AgentRequest]:
+        """`AgentRequest` subclass whose ``actions`` use the compiled union"""
+        if self._request_model is None:
+            self.compile()
+            self._request_model = create_model(
+                "TypedAgentRequest",
+                __base__=AgentRequest,
+                actions=(List[self._union()], Field(default_factory=list, description="Recent actions/mutations")),
+            )
+        return self._request_model
+
+    def response_model(self) -> Type[AgentResponse]:
+        """`AgentResponse` subclass whose ``actions`` use the compiled union"""
+        if self._response_model is None:
+            self.compile()
+            self._response_model = create_model(
+                "TypedAgentResponse",
+                __base__=AgentResponse,
+                actions=(Optional[List[self._union()]], Field(None, description="Actions to execute (optional)")),
+            )
+        return self._response_model
@@ -0,0 +1,169 @@
+"""Pooled outbound HTTP clients for agent handlers"""
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from .metrics import Metrics
+
+if TYPE_CHECKING:
+    import httpx
+
+
+def _import_httpx():
+    """Return the httpx module"""
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError("httpx is required. Install with: pip install agent-state-bridge[http]")
+    return httpx
+
+
+# `httpx.AsyncClient` arguments that configure the connection pool, so they
+# go to the shared per-host transport instead
+_TRANSPORT_OPTIONS = ("verify", "cert", "trust_env", "proxy")
+
+
+class HTTPClientPool:
+    """
+    Long-lived async HTTP clients shared by all requests.
+
+    Reusing clients keeps connections (and their TLS sessions) alive across
+    requests, so connection setup no longer shows up in per-request
+    latency. Each base URL gets its own `httpx.AsyncClient`; clients for
+    the same host share one connection pool, which caps the connections to
+    that host. A default client without a base URL serves everything else.
+
+    The pool is usually owned by `AgentBridge`, which opens it on startup
+    and closes it on shutdown. Handlers get clients through
+    `agent_state_bridge.runtime.get_http_client()`.
+
+    Args:
+        max_connections: Connection cap of the default client
+        max_keepalive_connections: Idle connections kept per client
+        keepalive_expiry: Seconds an idle connection is kept alive
+        max_connections_per_host: Connection cap of each host's pool
+                                  (default: `max_connections`)
+        http2: Negotiate HTTP/2 (requires ``httpx[http2]``)
+        timeout: Default request timeout in seconds
+        metrics: Metrics collector for request counts and pool size
+        **client_kwargs: Extra arguments for every `httpx.AsyncClient`
+
+    Example:
+        ```python
+        from agent_state_bridge.clients import HTTPClientPool
+        from agent_state_bridge.fastapi import AgentBridge
+        from agent_state_bridge.runtime import get_http_client
+
+        bridge = AgentBridge(http=HTTPClientPool(max_connections_per_host=20, http2=True))
+
+        @bridge.agent_handler
+        async def my_agent(messages, actions, context):
+            client = get_http_client("https://api.example.com")
+            r = await client.post("/v1/chat", json={"messages": [m.model_dump() for m in messages]})
+            return AgentResponse(response=r.json()["reply"])
+        ```
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        max_connections_per_host: Optional[int] = None,
+        http2: bool = False,
+        timeout: float = 60.0,
+        metrics: Optional[Metrics] = None,
+        **client_kwargs: Any,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.max_connections_per_host = max_connections_per_host or max_connections
+        self.http2 = http2
+        self.timeout = timeout
+        self.metrics = metrics
+        self.client_kwargs = client_kwargs
+        self._clients: Dict[str, "httpx.AsyncClient"] = {}
+        self._transports: Dict[str, "httpx.AsyncHTTPTransport"] = {}
+        self._requests: Dict[str, int] = {}
+        self._closed = False
+
+    def _transport(self, origin: str) -> "httpx.AsyncHTTPTransport":
+        """Connection pool shared by every client for `origin`"""
+        transport = self._transports.get(origin)
+        if transport is None:
+            httpx = _import_httpx()
+            cap = self.max_connections_per_host if origin else self.max_connections
+            options = {key: self.client_kwargs[key] for key in _TRANSPORT_OPTIONS if key in self.client_kwargs}
+            transport = self._transports[origin] = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=cap,
+                    max_keepalive_connections=min(self.max_keepalive_connections, cap),
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                http2=self.http2,
+                **options,
+            )
+        return transport
+
+    def _new_client(self, base_url: str, origin: str) -> "httpx.AsyncClient":
+        httpx = _import_httpx()
+
+        async def on_request(request):
+            self._requests[origin] = self._requests.get(origin, 0) + 1
+            if self.metrics is not None:
+                self.metrics.incr("http.requests")
+
+        kwargs = {key: value for key, value in self.client_kwargs.items() if key not in _TRANSPORT_OPTIONS}
+        hooks = kwargs.pop("event_hooks", {})
+        hooks = {**hooks, "request": [on_request, *hooks.get("request", [])]}
+        if base_url:
+            kwargs["base_url"] = base_url
+        if "transport" not in kwargs:
+            kwargs["transport"] = self._transport(origin)
+        return httpx.AsyncClient(timeout=self.timeout, event_hooks=hooks, **kwargs)
+
+    async def start(self) -> None:
+        """Open the default client"""
+        self._closed = False
+        self.client()
+
+    def client(self, base_url: Optional[str] = None) -> "httpx.AsyncClient":
+        """Shared client for `base_url` (path included), or the default client"""
+        if self._closed:
+            raise RuntimeError("HTTPClientPool is closed")
+        base_url = (base_url or "").rstrip("/")
+        client = self._clients.get(base_url)
+        if client is None:
+            origin = ""
+            if base_url:
+                parts = urlsplit(base_url)
+                origin = f"{parts.scheme}://{parts.netloc}"
+            client = self._clients[base_url] = self._new_client(base_url, origin)
+            if self.metrics is not None:
+                self.metrics.set_gauge("http.clients", len(self._clients))
+        return client
+
+    async def close(self) -> None:
+        """Close every client and its connections"""
+        self._closed = True
+        clients, self._clients = list(self._clients.values()), {}
+        transports, self._transports = list(self._transports.values()), {}
+        for client in clients:
+            await client.aclose()
+        for transport in transports:
+            await transport.aclose()
+        if self.metrics is not None:
+            self.metrics.set_gauge("http.clients", 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-host request counts and pool configuration"""
+        return {
+            "clients": len(self._clients),
+            "hosts": len([origin for origin in self._transports if origin]),
+            "requests": {origin or "default": count for origin, count in self._requests.items()},
+            "max_connections": self.max_connections,
+            "max_connections_per_host": self.max_connections_per_host,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
+            "http2": self.http2,
+        }
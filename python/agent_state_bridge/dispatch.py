@@ -0,0 +1,258 @@
+"""
+Dispatch policies for multiple agent backends.
+
+`create_agent_router` accepts several handlers (a dict of name -> handler)
+together with one of these policies:
+
+- `Hedge(delay)`: call the first backend; if it has not answered after
+  `delay` seconds (or fails), also call the next one. The first successful
+  response wins.
+- `Race()`: call every backend at once; the first successful response wins.
+- `FanOut(merge)`: call every backend and merge all successful responses,
+  e.g. to combine the `Action` lists proposed by different agents.
+
+Losing calls are cancelled. Per-backend outcomes are counted in metrics as
+``backend.<name>.wins``, ``.errors``, ``.cancelled`` and ``.completed``.
+
+Example:
+    ```python
+    from agent_state_bridge.dispatch import Hedge
+    from agent_state_bridge.fastapi import create_agent_router
+
+    router = create_agent_router(
+        {"openai": openai_agent, "azure": azure_agent},
+        policy=Hedge(delay=1.5),
+    )
+    ```
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .metrics import Metrics
+from .models import Action, AgentResponse, Message
+from .runtime import RequestScope, current_scope, enter_scope
+
+Handler = Callable[[List[Message], List[Action], Dict[str, Any]], Awaitable[AgentResponse]]
+Backends = List[Tuple[str, Handler]]
+
+
+async def _call_in_scope(handler: Handler, args: tuple, scope: Optional[RequestScope]) -> AgentResponse:
+    if scope is not None:
+        enter_scope(scope)  # The task runs in its own copy of the context
+    return await handler(*args)
+
+
+class _Policy:
+    """Base class for dispatch policies"""
+
+    async def run(self, backends: Backends, args: tuple, metrics: Metrics) -> AgentResponse:
+        raise NotImplementedError
+
+    @staticmethod
+    def _start(handler: Handler, args: tuple, scopes: Dict["asyncio.Future", RequestScope]) -> "asyncio.Future":
+        """
+        Start one backend call with its own child scope, so jobs it defers
+        are only kept if its response is used (see `_adopt`)
+        """
+        parent = current_scope()
+        child = parent.child() if parent is not None else None
+        task = asyncio.ensure_future(_call_in_scope(handler, args, child))
+        if child is not None:
+            scopes[task] = child
+        return task
+
+    @staticmethod
+    def _adopt(task: "asyncio.Future", scopes: Dict["asyncio.Future", RequestScope]) -> None:
+        """Keep the deferred jobs of a backend whose response is used"""
+        parent, child = current_scope(), scopes.get(task)
+        if parent is not None and child is not None:
+            parent.deferred.extend(child.deferred)
+
+    @staticmethod
+    def _cancel(tasks: Dict["asyncio.Future", str], metrics: Metrics) -> None:
+        for task, name in tasks.items():
+            if not task.done():
+                task.cancel()
+                metrics.incr(f"backend.{name}.cancelled")
+
+    @staticmethod
+    def _record(task: "asyncio.Future", name: str, metrics: Metrics) -> Optional[BaseException]:
+        """Count a finished call; return its exception, if any"""
+        error = task.exception()
+        metrics.incr(f"backend.{name}.errors" if error else f"backend.{name}.completed")
+        return error
+
+
+class Hedge(_Policy):
+    """
+    Call backends one after another, `delay` seconds apart.
+
+    The next backend is also started immediately when a running one fails.
+    The first successful response is returned and the others are cancelled.
+    """
+
+    def __init__(self, delay: float = 1.0):
+        self.delay = delay
+
+    async def run(self, backends: Backends, args: tuple, metrics: Metrics) -> AgentResponse:
+        waiting = list(backends)
+        running: Dict["asyncio.Future", str] = {}
+        scopes: Dict["asyncio.Future", RequestScope] = {}
+        last_error: Optional[BaseException] = None
+        launch = True
+        try:
+            while True:
+                if launch and waiting:
+                    name, handler = waiting.pop(0)
+                    running[self._start(handler, args, scopes)] = name
+                    if len(running) > 1 or last_error is not None:
+                        metrics.incr("hedge.fired")
+                launch = False
+                done, _ = await asyncio.wait(
+                    running, timeout=self.delay if waiting else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    launch = True  # Hedge delay elapsed
+                    continue
+                for task in done:
+                    name = running.pop(task)
+                    error = self._record(task, name, metrics)
+                    if error is None:
+                        metrics.incr(f"backend.{name}.wins")
+                        self._adopt(task, scopes)
+                        return task.result()
+                    last_error = error
+                if not running and not waiting:
+                    raise last_error
+                launch = True  # A backend failed: try the next one now
+        finally:
+            self._cancel(running, metrics)
+
+
+class Race(_Policy):
+    """Call every backend at once; the first successful response wins"""
+
+    async def run(self, backends: Backends, args: tuple, metrics: Metrics) -> AgentResponse:
+        scopes: Dict["asyncio.Future", RequestScope] = {}
+        running = {self._start(handler, args, scopes): name for name, handler in backends}
+        last_error: Optional[BaseException] = None
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    error = self._record(task, name, metrics)
+                    if error is None:
+                        metrics.incr(f"backend.{name}.wins")
+                        self._adopt(task, scopes)
+                        return task.result()
+                    last_error = error
+            raise last_error
+        finally:
+            self._cancel(running, metrics)
+
+
+def merge_responses(responses: Sequence[Tuple[str, AgentResponse]]) -> AgentResponse:
+    """
+    Default `FanOut` merge.
+
+    Uses the response text of the first backend (in declaration order),
+    concatenates every backend's actions (dropping exact duplicates) and
+    merges contexts, later backends overriding earlier keys.
+    """
+    actions: List[Action] = []
+    seen = set()
+    context: Dict[str, Any] = {}
+    for _, response in responses:
+        for action in response.actions or []:
+            key = action.model_dump_json()
+            if key not in seen:
+                seen.add(key)
+                actions.append(action)
+        context.update(response.context or {})
+    return AgentResponse(
+        response=responses[0][1].response,
+        actions=actions or None,
+        context=context or None,
+    )
+
+
+class FanOut(_Policy):
+    """
+    Call every backend and merge all successful responses.
+
+    Args:
+        merge: Combines ``[(name, response), ...]`` in declaration order into
+               one response (default: `merge_responses`)
+        timeout: Seconds to wait for slow backends; they are cancelled and
+                 left out of the merge (default: wait for all)
+    """
+
+    def __init__(
+        self,
+        merge: Optional[Callable[[Sequence[Tuple[str, AgentResponse]]], AgentResponse]] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.merge = merge or merge_responses
+        self.timeout = timeout
+
+    async def run(self, backends: Backends, args: tuple, metrics: Metrics) -> AgentResponse:
+        scopes: Dict["asyncio.Future", RequestScope] = {}
+        running = {self._start(handler, args, scopes): name for name, handler in backends}
+        order = {name: i for i, (name, _) in enumerate(backends)}
+        try:
+            done, _ = await asyncio.wait(running, timeout=self.timeout)
+        finally:
+            self._cancel(running, metrics)
+        results: List[Tuple[str, AgentResponse]] = []
+        merged: List["asyncio.Future"] = []
+        last_error: Optional[BaseException] = None
+        for task in done:
+            name = running[task]
+            error = self._record(task, name, metrics)
+            if error is None:
+                results.append((name, task.result()))
+                merged.append(task)
+            else:
+                last_error = error
+        if not results:
+            raise last_error or asyncio.TimeoutError("No backend answered in time")
+        results.sort(key=lambda item: order[item[0]])
+        response = self.merge(results)
+        for task in sorted(merged, key=lambda t: order[running[t]]):
+            self._adopt(task, scopes)
+        return response
+
+
+def combine_handlers(
+    handlers: Union[Mapping[str, Handler], Sequence[Handler]],
+    policy: Optional[_Policy] = None,
+    metrics: Optional[Metrics] = None,
+) -> Handler:
+    """
+    Combine several backends into one handler using `policy` (default: `Hedge()`).
+
+    `handlers` is a mapping of backend name to handler, or a sequence of
+    handlers named after their ``__name__``; repeated names (e.g. several
+    lambdas) get their position appended, as in ``<lambda>_1``.
+    """
+    if isinstance(handlers, Mapping):
+        backends = list(handlers.items())
+    else:
+        backends = []
+        names = set()
+        for i, h in enumerate(handlers):
+            name = getattr(h, "__name__", f"backend{i}")
+            if name in names:
+                name = f"{name}_{i}"
+            names.add(name)
+            backends.append((name, h))
+    if not backends:
+        raise ValueError("At least one agent handler is required")
+    policy = policy or Hedge()
+    metrics = metrics if metrics is not None else Metrics()
+
+    async def combined(messages: List[Message], actions: List[Action], context: Dict[str, Any]) -> AgentResponse:
+        return await policy.run(backends, (messages, actions, context), metrics)
+
+    return combined
@@ -1,17 +1,96 @@
 """Django REST Framework integration for agent-state-bridge"""
+from functools import lru_cache
 from typing import Callable
-try:
-    from rest_framework.decorators import api_view
-    from rest_framework.response import Response
-    from rest_framework.views import APIView
-    from rest_framework import status
-except ImportError:
-    raise ImportError("Django REST Framework is required. Install with: pip install agent-state-bridge[django]")
+
+from . import wire
+
+
+def _import_drf():
+    """Return the DRF names the views below need"""
+    try:
+        from rest_framework.decorators import api_view
+        from rest_framework.response import Response
+        from rest_framework.views import APIView
+        from rest_framework import status
+    except ImportError:
+        raise ImportError("Django REST Framework is required. Install with: pip install agent-state-bridge[django]")
+    return api_view, Response, APIView, status
+
+
+@lru_cache(maxsize=None)
+def _build_wire_classes():
+    """Create the MessagePack parser and renderer once DRF is importable"""
+    _import_drf()
+    from rest_framework.exceptions import ParseError
+    from rest_framework.parsers import BaseParser
+    from rest_framework.renderers import BaseRenderer
+
+    class MessagePackParser(BaseParser):
+        """Parse ``application/msgpack`` request bodies"""
+
+        media_type = wire.MSGPACK
+
+        def parse(self, stream, media_type=None, parser_context=None):
+            try:
+                return wire.unpackb(stream.read())
+            except ValueError as e:
+                raise ParseError(str(e))
+
+    class MessagePackRenderer(BaseRenderer):
+        """Render responses as MessagePack for ``Accept: application/msgpack``"""
+
+        media_type = wire.MSGPACK
+        format = "msgpack"
+        charset = None
+        render_style = "binary"
+
+        def render(self, data, accepted_media_type=None, renderer_context=None):
+            return b"" if data is None else wire.packb(data)
+
+    return MessagePackParser, MessagePackRenderer
+
+
+@lru_cache(maxsize=None)
+def _build_negotiation_class():
+    """Content negotiation that answers with the first renderer (JSON) instead of 406"""
+    _import_drf()
+    from rest_framework.exceptions import NotAcceptable
+    from rest_framework.negotiation import DefaultContentNegotiation
+
+    class FallbackContentNegotiation(DefaultContentNegotiation):
+        def select_renderer(self, request, renderers, format_suffix=None):
+            try:
+                return super().select_renderer(request, renderers, format_suffix)
+            except NotAcceptable:
+                return renderers[0], renderers[0].media_type
+
+    return FallbackContentNegotiation
+
+
+def _wire_settings():
+    """
+    Parser classes, renderer classes and content negotiation for the views.
+
+    DRF's defaults, plus MessagePack when it is installed. Without it, DRF
+    answers MessagePack bodies with 415 and responses fall back to JSON.
+    """
+    from rest_framework.settings import api_settings
+
+    parsers = list(api_settings.DEFAULT_PARSER_CLASSES)
+    renderers = list(api_settings.DEFAULT_RENDERER_CLASSES)
+    if wire.msgpack_available():
+        parser, renderer = _build_wire_classes()
+        parsers.append(parser)
+        renderers.append(renderer)
+    return parsers, renderers, _build_negotiation_class()
 
 
 def agent_api_view(handler: Callable[[str, dict], str]):
     """
     Decorator for Django REST Framework function-based views.
+
+    Bodies are JSON or ``application/msgpack``; responses are MessagePack
+    when the ``Accept`` header asks for it.
     
     Example:
         ```python
@@ -25,7 +104,19 @@ def agent_api_view(handler: Callable[[str, dict], str]):
         # path('chat/', my_agent)
         ```
     """
+    api_view, Response, _, status = _import_drf()
+    from rest_framework.decorators import parser_classes, renderer_classes
+
+    parsers, renderers, negotiation = _wire_settings()
+
+    def content_negotiation_class(func):
+        func.content_negotiation_class = negotiation
+        return func
+
     @api_view(['POST'])
+    @parser_classes(parsers)
+    @renderer_classes(renderers)
+    @content_negotiation_class
     def wrapper(request):
         message = request.data.get('message', '')
         state_data = request.data.get('state', {})
@@ -42,44 +133,72 @@ def agent_api_view(handler: Callable[[str, dict], str]):
     return wrapper
 
 
-class AgentAPIView(APIView):
-    """
-    Class-based view for Django REST Framework.
+def _build_agent_api_view():
+    """Create the AgentAPIView class once DRF is importable"""
+    _, Response, APIView, status = _import_drf()
+    parsers, renderers, negotiation = _wire_settings()
+
+    class AgentAPIView(APIView):
+        """
+        Class-based view for Django REST Framework.
     
-    Override the `process_agent` method to implement your agent logic.
+        Override the `process_agent` method to implement your agent logic.
     
-    Example:
-        ```python
-        from agent_state_bridge.django import AgentAPIView
+        Example:
+            ```python
+            from agent_state_bridge.django import AgentAPIView
         
-        class MyAgentView(AgentAPIView):
-            def process_agent(self, message: str, state: dict) -> str:
-                return f"Processed: {message}"
+            class MyAgentView(AgentAPIView):
+                def process_agent(self, message: str, state: dict) -> str:
+                    return f"Processed: {message}"
         
-        # In urls.py:
-        # path('chat/', MyAgentView.as_view())
-        ```
-    """
+            # In urls.py:
+            # path('chat/', MyAgentView.as_view())
+            ```
+
+        Accepts JSON or ``application/msgpack`` bodies and renders
+        MessagePack for ``Accept: application/msgpack``.
+        """
+
+        parser_classes = parsers
+        renderer_classes = renderers
+        content_negotiation_class = negotiation
     
-    def process_agent(self, message: str, state: dict) -> str:
-        """Override this method to implement agent logic"""
-        raise NotImplementedError("Subclasses must implement process_agent method")
+        def process_agent(self, message: str, state: dict) -> str:
+            """Override this method to implement agent logic"""
+            raise NotImplementedError("Subclasses must implement process_agent method")
     
-    def post(self, request):
-        """Handle POST request"""
-        message = request.data.get('message', '')
-        state_data = request.data.get('state', {})
+        def post(self, request):
+            """Handle POST request"""
+            message = request.data.get('message', '')
+            state_data = request.data.get('state', {})
         
-        try:
-            response = self.process_agent(message, state_data)
-            return Response({'response': response})
-        except NotImplementedError:
-            return Response(
-                {'error': 'process_agent method not implemented'},
-                status=status.HTTP_501_NOT_IMPLEMENTED
-            )
-        except Exception as e:
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+            try:
+                response = self.process_agent(message, state_data)
+                return Response({'response': response})
+            except NotImplementedError:
+                return Response(
+                    {'error': 'process_agent method not implemented'},
+                    status=status.HTTP_501_NOT_IMPLEMENTED
+                )
+            except Exception as e:
+                return Response(
+                    {'error': str(e)},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+
+    return AgentAPIView
+
+
+def __getattr__(name):
+    # AgentAPIView and the MessagePack parser/renderer subclass DRF classes,
+    # so they are created on first access instead of at import time.
+    if name == "AgentAPIView":
+        view = _build_agent_api_view()
+        globals()[name] = view
+        return view
+    if name in ("MessagePackParser", "MessagePackRenderer"):
+        parser, renderer = _build_wire_classes()
+        globals().update(MessagePackParser=parser, MessagePackRenderer=renderer)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,25 +1,186 @@
 """FastAPI integration for agent-state-bridge"""
-from typing import Callable, Awaitable, List, Dict, Any
-from fastapi import APIRouter
-from .models import AgentRequest, AgentResponse, Message, Action
+import math
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Awaitable, List, Dict, Any, Mapping, Optional, Union
+from . import wire
+from .metrics import Metrics
+from .runtime import RequestScope, enter_scope, exit_scope
+
+# FastAPI, pydantic and asyncio are imported when the first router is
+# created, not at module import, to keep cold starts cheap.
+if TYPE_CHECKING:
+    import asyncio
+    from fastapi import APIRouter, Request
+    from .actions import ActionCompactor, ActionRegistry
+    from .clients import HTTPClientPool
+    from .dispatch import _Policy
+    from .intents import IntentRouter
+    from .store import Store
+    from .tasks import BackgroundQueue
+    from .models import AgentResponse, Message, Action
+
+DEADLINE_HEADER = "X-Agent-Timeout"
+
+
+def _resolve_timeout(header_value: Optional[str], default: Optional[float]) -> Optional[float]:
+    """Effective timeout: the shorter of the client's header and the router default"""
+    try:
+        requested = float(header_value) if header_value is not None else None
+    except ValueError:
+        requested = None
+    if requested is not None and (not math.isfinite(requested) or requested <= 0):
+        requested = None
+    if requested is None:
+        return default
+    return requested if default is None else min(requested, default)
+
+
+async def _wait_for_disconnect(request: "Request", poll_interval: float) -> None:
+    """Return once the client has gone away"""
+    import asyncio
+
+    while not await request.is_disconnected():
+        await asyncio.sleep(poll_interval)
+
+
+async def _run_handler(
+    task: "asyncio.Task",
+    request: "Request",
+    timeout: Optional[float],
+    poll_interval: float,
+    metrics: Metrics,
+):
+    """Await the handler task, cancelling it on timeout or client disconnect"""
+    import asyncio
+    from fastapi import HTTPException
+
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request, poll_interval))
+    try:
+        done, _ = await asyncio.wait(
+            {task, watcher}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        watcher.cancel()
+
+    if task in done:
+        return task.result()
+
+    task.cancel()
+    if watcher in done:
+        metrics.incr("cancelled")
+        raise HTTPException(status_code=499, detail="Client disconnected")
+    metrics.incr("timed_out")
+    raise HTTPException(status_code=504, detail="Agent handler exceeded its deadline")
+
+
+@lru_cache(maxsize=None)
+def _wire_route_class():
+    """APIRoute that also accepts MessagePack request bodies"""
+    from fastapi import HTTPException, Request
+    from fastapi.routing import APIRoute
+
+    class MessagePackRequest(Request):
+        async def json(self) -> Any:
+            if not hasattr(self, "_msgpack"):
+                self._msgpack = wire.unpackb(await self.body())
+            return self._msgpack
+
+    class WireRoute(APIRoute):
+        def get_route_handler(self):
+            handler = super().get_route_handler()
+
+            async def route_handler(request: Request):
+                if wire.is_msgpack(request.headers.get("content-type")):
+                    if not wire.msgpack_available():
+                        raise HTTPException(
+                            status_code=415,
+                            detail="MessagePack requires: pip install agent-state-bridge[msgpack]",
+                        )
+                    # FastAPI only parses bodies labelled as JSON, so label the
+                    # request JSON and serve the decoded MessagePack from json()
+                    scope = dict(request.scope)
+                    scope["headers"] = [
+                        (name, value) for name, value in request.scope["headers"] if name != b"content-type"
+                    ] + [(b"content-type", wire.JSON.encode())]
+                    request = MessagePackRequest(scope, request.receive)
+                return await handler(request)
+
+            return route_handler
+
+    return WireRoute
+
+
+AgentHandler = Callable[[List["Message"], List["Action"], Dict[str, Any]], Awaitable["AgentResponse"]]
 
 
 def create_agent_router(
-    agent_handler: Callable[[List[Message], List[Action], Dict[str, Any]], Awaitable[AgentResponse]],
+    agent_handler: Union[AgentHandler, Mapping[str, AgentHandler], List[AgentHandler]],
     prefix: str = "",
-    tags: list[str] = None
-) -> APIRouter:
+    tags: list[str] = None,
+    timeout: Optional[float] = None,
+    deadline_header: str = DEADLINE_HEADER,
+    disconnect_poll_interval: float = 0.5,
+    metrics: Optional[Metrics] = None,
+    compactor: Optional["ActionCompactor"] = None,
+    store: Optional["Store"] = None,
+    http_pool: Optional["HTTPClientPool"] = None,
+    policy: Optional["_Policy"] = None,
+    intents: Optional["IntentRouter"] = None,
+    registry: Optional["ActionRegistry"] = None,
+    task_queue: Optional["BackgroundQueue"] = None,
+) -> "APIRouter":
     """
     Create a FastAPI router with agent chat endpoint.
     
     Args:
         agent_handler: Async function that takes (messages, actions, context) 
-                      and returns AgentResponse
+                      and returns AgentResponse, or several such functions
+                      (a dict of backend name to handler, or a list)
+                      combined with `policy`
         prefix: Router prefix (default: "")
         tags: Router tags for OpenAPI docs
+        timeout: Default per-request deadline in seconds (default: no deadline)
+        deadline_header: Header a client can use to request a shorter deadline
+                         in seconds (default: "X-Agent-Timeout")
+        disconnect_poll_interval: How often to check for client disconnect
+        metrics: Metrics collector (default: a new `Metrics`, exposed as
+                 ``router.metrics``)
+        compactor: Optional `ActionCompactor` applied to the incoming
+                   actions before the handler runs and to the actions it
+                   returns
+        store: Optional shared `Store` for sessions and caches, available to
+               handlers through `agent_state_bridge.runtime.get_store()`
+        http_pool: Optional `HTTPClientPool` for outbound calls, available to
+                   handlers through `agent_state_bridge.runtime.get_http_client()`.
+                   The caller owns its lifecycle (see `AgentBridge`).
+        policy: How to combine multiple handlers: `Hedge(delay)` (default),
+                `Race()` or `FanOut(merge)` from `agent_state_bridge.dispatch`
+        intents: Optional `IntentRouter` tried before the handler; a
+                 confident match is answered without calling the LLM
+        registry: Optional `ActionRegistry`; request actions are validated
+                  against it at parse time (422 on bad actions) and the
+                  actions a handler returns are validated before sending
+        task_queue: Optional `BackgroundQueue` for work handlers schedule
+                    with `agent_state_bridge.runtime.defer()`; it is
+                    enqueued after the response has been sent
         
     Returns:
         FastAPI APIRouter with /chat endpoint
+
+    The handler runs as its own task. It is cancelled when the deadline
+    passes (504) or the client disconnects (499), so cancellation reaches
+    any downstream async calls. Handlers can read the deadline with
+    `agent_state_bridge.runtime.remaining_time()`.
+
+    Requests and responses are JSON by default. With the ``msgpack`` extra
+    installed, clients can send ``Content-Type: application/msgpack`` and
+    ask for ``Accept: application/msgpack`` instead (see
+    `agent_state_bridge.wire`).
         
     Example:
         ```python
@@ -37,10 +198,57 @@ def create_agent_router(
         app.include_router(router)
         ```
     """
-    router = APIRouter(prefix=prefix, tags=tags or ["agent"])
+    import asyncio
+    from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, Response
+    from .models import AgentRequest, AgentResponse
+
+    request_model = registry.request_model() if registry is not None else AgentRequest
+    response_model = registry.response_model() if registry is not None else AgentResponse
+
+    router = APIRouter(prefix=prefix, tags=tags or ["agent"], route_class=_wire_route_class())
+    metrics = metrics if metrics is not None else Metrics()
+    router.metrics = metrics
+    if store is not None and store.metrics is None:
+        store.metrics = metrics
+    if http_pool is not None and http_pool.metrics is None:
+        http_pool.metrics = metrics
+    if task_queue is not None and task_queue.metrics is None:
+        task_queue.metrics = metrics
+    if intents is not None and intents.metrics is None:
+        intents.metrics = metrics
+    if isinstance(agent_handler, (Mapping, list, tuple)):
+        from .dispatch import combine_handlers
+        agent_handler = combine_handlers(agent_handler, policy, metrics)
+
+    def compact(actions):
+        compacted = compactor.compact(actions)
+        metrics.incr("actions_compacted", len(actions) - len(compacted))
+        return compacted
+
+    def finalize(response):
+        if compactor and response.actions:
+            response.actions = compact(response.actions) or None
+        if registry is not None and response.actions:
+            response.actions = registry.validate(response.actions)
+        metrics.incr("completed")
+        return response
+
+    def encode(response, http_request):
+        if wire.accepts_msgpack(http_request.headers.get("accept")) and wire.msgpack_available():
+            return Response(wire.packb(response.model_dump(mode="json")), media_type=wire.MSGPACK)
+        return response
     
-    @router.post("/chat", response_model=AgentResponse)
-    async def chat_endpoint(request: AgentRequest) -> AgentResponse:
+    @router.post(
+        "/chat",
+        response_model=response_model,
+        responses={200: {"content": {wire.MSGPACK: {}}}},
+        # Same shape as the JSON body; no schema reference here because
+        # FastAPI may rename the component when several registries are used
+        openapi_extra={"requestBody": {"content": {wire.MSGPACK: {}}}},
+    )
+    async def chat_endpoint(
+        request: request_model, http_request: Request, background: BackgroundTasks
+    ) -> AgentResponse:
         """
         Agent chat endpoint.
         
@@ -54,7 +262,47 @@ def create_agent_router(
         - actions: Optional actions to execute
         - context: Optional updated context
         """
-        return await agent_handler(request.messages, request.actions, request.context)
+        metrics.incr("requests")
+        effective_timeout = _resolve_timeout(http_request.headers.get(deadline_header), timeout)
+        deadline = time.monotonic() + effective_timeout if effective_timeout is not None else None
+        
+        actions = compact(request.actions) if compactor else request.actions
+        
+        if intents is not None:
+            try:
+                response = intents.match(request.messages, actions, request.context)
+                if response is not None:
+                    response = finalize(response)
+            except Exception:
+                metrics.incr("errors")
+                raise
+            if response is not None:
+                return encode(response, http_request)
+        
+        scope = RequestScope(
+            deadline=deadline, metrics=metrics, store=store, http=http_pool, tasks=task_queue
+        )
+        token = enter_scope(scope)
+        try:
+            task = asyncio.ensure_future(
+                agent_handler(request.messages, actions, request.context)
+            )
+        finally:
+            exit_scope(token)
+        
+        try:
+            response = await _run_handler(
+                task, http_request, effective_timeout, disconnect_poll_interval, metrics
+            )
+            response = finalize(response)
+        except HTTPException:
+            raise
+        except Exception:
+            metrics.incr("errors")
+            raise
+        for fn, args, kwargs in scope.deferred:
+            background.add_task(task_queue.submit, fn, *args, **kwargs)
+        return encode(response, http_request)
     
     return router
 
@@ -78,24 +326,128 @@ class AgentBridge:
             last_msg = messages[-1].content if messages else ""
             return AgentResponse(response=f"Got: {last_msg}")
         ```
+
+    The bridge also owns shared resources for the app's lifetime: an
+    `HTTPClientPool` (``http``) is opened on startup and closed on shutdown,
+    a `BackgroundQueue` (``tasks``) is started on startup and drained on
+    shutdown (up to ``drain_timeout`` seconds), and a `Store` is closed
+    (flushing pending writes) on shutdown. Register
+    extra work with `on_startup` / `on_shutdown`; `init_app` hooks all of
+    it into the app's lifespan.
     """
     
-    def __init__(self, app=None, prefix: str = "", tags: list[str] = None):
+    def __init__(
+        self,
+        app=None,
+        prefix: str = "",
+        tags: list[str] = None,
+        timeout: Optional[float] = None,
+        metrics: Optional[Metrics] = None,
+        compactor: Optional["ActionCompactor"] = None,
+        store: Optional["Store"] = None,
+        http: Optional["HTTPClientPool"] = None,
+        intents: Optional["IntentRouter"] = None,
+        registry: Optional["ActionRegistry"] = None,
+        tasks: Optional["BackgroundQueue"] = None,
+        drain_timeout: Optional[float] = 10.0,
+    ):
         self.prefix = prefix
         self.tags = tags or ["agent"]
+        self.timeout = timeout
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.compactor = compactor
+        self.store = store
+        self.http = http
+        self.intents = intents
+        self.registry = registry
+        self.tasks = tasks
+        self.drain_timeout = drain_timeout
         self._handler = None
+        self._startup_hooks: List[Callable] = []
+        self._shutdown_hooks: List[Callable] = []
         if app:
             self.init_app(app)
     
-    def agent_handler(self, func: Callable[[List[Message], List[Action], Dict[str, Any]], Awaitable[AgentResponse]]):
+    def agent_handler(self, func: AgentHandler):
         """Decorator to register agent handler"""
         self._handler = func
         return func
+
+    def on_startup(self, func: Callable):
+        """Decorator to register a (sync or async) startup hook"""
+        self._startup_hooks.append(func)
+        return func
+
+    def on_shutdown(self, func: Callable):
+        """Decorator to register a (sync or async) shutdown hook"""
+        self._shutdown_hooks.append(func)
+        return func
+
+    async def startup(self):
+        """Open owned resources, then run startup hooks"""
+        if self.http is not None:
+            if self.http.metrics is None:
+                self.http.metrics = self.metrics
+            await self.http.start()
+        if self.tasks is not None:
+            if self.tasks.metrics is None:
+                self.tasks.metrics = self.metrics
+            await self.tasks.start()
+        import inspect
+        for hook in self._startup_hooks:
+            result = hook()
+            if inspect.isawaitable(result):
+                await result
+
+    async def shutdown(self):
+        """Run shutdown hooks in reverse order, then close owned resources"""
+        import inspect
+        for hook in reversed(self._shutdown_hooks):
+            result = hook()
+            if inspect.isawaitable(result):
+                await result
+        if self.tasks is not None:
+            await self.tasks.drain(self.drain_timeout)
+        if self.http is not None:
+            await self.http.close()
+        if self.store is not None:
+            self.store.close()
+
+    @asynccontextmanager
+    async def lifespan(self, app=None):
+        """Lifespan context manager, e.g. ``FastAPI(lifespan=bridge.lifespan)``"""
+        await self.startup()
+        try:
+            yield
+        finally:
+            await self.shutdown()
     
     def init_app(self, app):
         """Initialize with FastAPI app"""
         if not self._handler:
             raise ValueError("No agent handler registered. Use @bridge.agent_handler decorator")
         
-        router = create_agent_router(self._handler, self.prefix, self.tags)
+        router = create_agent_router(
+            self._handler,
+            self.prefix,
+            self.tags,
+            timeout=self.timeout,
+            metrics=self.metrics,
+            compactor=self.compactor,
+            store=self.store,
+            http_pool=self.http,
+            intents=self.intents,
+            registry=self.registry,
+            task_queue=self.tasks,
+        )
         app.include_router(router)
+
+        app_lifespan = app.router.lifespan_context
+
+        @asynccontextmanager
+        async def lifespan(app):
+            async with self.lifespan(app):
+                async with app_lifespan(app) as state:
+                    yield state
+
+        app.router.lifespan_context = lifespan
@@ -1,10 +1,40 @@
 """Flask integration for agent-state-bridge"""
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 from functools import wraps
-try:
-    from flask import request, jsonify, Blueprint
-except ImportError:
-    raise ImportError("Flask is required. Install with: pip install agent-state-bridge[flask]")
+
+from . import wire
+
+if TYPE_CHECKING:
+    from flask import Blueprint
+
+
+def _import_flask():
+    """Return the flask module"""
+    try:
+        import flask
+    except ImportError:
+        raise ImportError("Flask is required. Install with: pip install agent-state-bridge[flask]")
+    return flask
+
+
+def _read_payload(request) -> dict:
+    """Request body as a dict, decoded from MessagePack or JSON"""
+    if wire.is_msgpack(request.content_type):
+        if not wire.msgpack_available():
+            _import_flask().abort(415, "MessagePack requires: pip install agent-state-bridge[msgpack]")
+        try:
+            return wire.unpackb(request.get_data())
+        except ValueError as e:
+            _import_flask().abort(400, str(e))
+    return request.get_json()
+
+
+def _make_response(payload: dict):
+    """JSON response, or MessagePack if the client's Accept header prefers it"""
+    flask = _import_flask()
+    if wire.accepts_msgpack(flask.request.headers.get("Accept")) and wire.msgpack_available():
+        return flask.Response(wire.packb(payload), mimetype=wire.MSGPACK)
+    return flask.jsonify(payload)
 
 
 def create_agent_blueprint(
@@ -21,7 +51,9 @@ def create_agent_blueprint(
         url_prefix: URL prefix for the blueprint
         
     Returns:
-        Flask Blueprint with /chat endpoint
+        Flask Blueprint with /chat endpoint. Bodies are JSON, or
+        MessagePack when sent as ``application/msgpack``; the response is
+        MessagePack when the ``Accept`` header prefers it.
         
     Example:
         ```python
@@ -36,17 +68,19 @@ def create_agent_blueprint(
         app.register_blueprint(bp)
         ```
     """
-    bp = Blueprint(name, __name__, url_prefix=url_prefix)
+    flask = _import_flask()
+    request = flask.request
+    bp = flask.Blueprint(name, __name__, url_prefix=url_prefix)
     
     @bp.route("/chat", methods=["POST"])
     def chat_endpoint():
         """Agent chat endpoint"""
-        data = request.get_json()
+        data = _read_payload(request)
         message = data.get("message", "")
         state = data.get("state", {})
         
         response = agent_handler(message, state)
-        return jsonify({"response": response})
+        return _make_response({"response": response})
     
     return bp
 
@@ -68,13 +102,16 @@ def agent_route(handler: Callable[[str, dict], str]):
             return f"Got: {message}"
         ```
     """
+    flask = _import_flask()
+    request = flask.request
+
     @wraps(handler)
     def wrapper():
-        data = request.get_json()
+        data = _read_payload(request)
         message = data.get("message", "")
         state = data.get("state", {})
         
         response = handler(message, state)
-        return jsonify({"response": response})
+        return _make_response({"response": response})
     
     return wrapper
@@ -0,0 +1,129 @@
+"""Compact in-memory conversation history for agent-state-bridge"""
+import sys
+from array import array
+from enum import IntEnum
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .models import Message
+
+
+class Role(IntEnum):
+    """Built-in message roles, stored as one byte per turn"""
+    USER = 0
+    ASSISTANT = 1
+    SYSTEM = 2
+    TOOL = 3
+
+
+_BUILTIN_ROLES = [role.name.lower() for role in Role]
+
+
+class CompactHistory:
+    """
+    Memory-efficient container for long conversation histories.
+
+    Roles are stored as one byte per turn and contents as plain strings
+    (optionally interned, so repeated turns share one object). `Message`
+    instances are only created when a handler asks for them via
+    `to_messages()`, indexing or slicing.
+
+    Example:
+        ```python
+        from agent_state_bridge.history import CompactHistory
+
+        history = CompactHistory(intern=True)
+        history.extend(request.messages)
+        history.append("assistant", reply)
+
+        recent = history[-20:]          # List[Message]
+        everything = history.to_messages()
+        ```
+    """
+
+    __slots__ = ("_roles", "_contents", "_role_names", "_role_codes", "_intern")
+
+    def __init__(self, messages: Optional[Iterable[Union[Message, Dict[str, Any]]]] = None, intern: bool = False):
+        self._roles = array("B")
+        self._contents: List[str] = []
+        self._role_names: List[str] = list(_BUILTIN_ROLES)
+        self._role_codes: Dict[str, int] = {name: code for code, name in enumerate(_BUILTIN_ROLES)}
+        self._intern = intern
+        if messages is not None:
+            self.extend(messages)
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[Union[Message, Dict[str, Any]]], intern: bool = False) -> "CompactHistory":
+        """Build a history from `Message` instances or plain dicts"""
+        return cls(messages, intern=intern)
+
+    def _role_code(self, role: str) -> int:
+        code = self._role_codes.get(role)
+        if code is None:
+            code = len(self._role_names)
+            if code > 255:
+                raise ValueError("CompactHistory supports at most 256 distinct roles")
+            self._role_names.append(role)
+            self._role_codes[role] = code
+        return code
+
+    def append(self, role: Union[str, Role], content: str) -> None:
+        """Add one turn"""
+        if isinstance(role, Role):
+            role = _BUILTIN_ROLES[role]
+        self._roles.append(self._role_code(role))
+        self._contents.append(sys.intern(content) if self._intern else content)
+
+    def extend(self, messages: Iterable[Union[Message, Dict[str, Any]]]) -> None:
+        """Add many turns from `Message` instances or plain dicts"""
+        for msg in messages:
+            if isinstance(msg, dict):
+                self.append(msg["role"], msg["content"])
+            else:
+                self.append(msg.role, msg.content)
+
+    def clear(self) -> None:
+        """Remove all turns"""
+        self._roles = array("B")
+        self._contents = []
+
+    def role_at(self, index: int) -> str:
+        """Role of one turn, without building a `Message`"""
+        return self._role_names[self._roles[index]]
+
+    def content_at(self, index: int) -> str:
+        """Content of one turn, without building a `Message`"""
+        return self._contents[index]
+
+    def pairs(self) -> Iterator[Tuple[str, str]]:
+        """Iterate ``(role, content)`` tuples, without building `Message`s"""
+        names = self._role_names
+        for code, content in zip(self._roles, self._contents):
+            yield names[code], content
+
+    def to_messages(self) -> List[Message]:
+        """
+        Full history as a new list of `Message` instances.
+
+        The list is not kept, so the history stays compact; call
+        `to_messages()` once per request rather than per access.
+        """
+        return [Message(role=role, content=content) for role, content in self.pairs()]
+
+    def __len__(self) -> int:
+        return len(self._roles)
+
+    def __iter__(self) -> Iterator[Message]:
+        for role, content in self.pairs():
+            yield Message(role=role, content=content)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Message, List[Message]]:
+        names = self._role_names
+        if isinstance(index, slice):
+            return [
+                Message(role=names[code], content=content)
+                for code, content in zip(self._roles[index], self._contents[index])
+            ]
+        return Message(role=names[self._roles[index]], content=self._contents[index])
+
+    def __repr__(self) -> str:
+        return f"CompactHistory(turns={len(self)})"
@@ -0,0 +1,112 @@
+"""
+Deterministic fast path for trivially structured commands.
+
+An `IntentRouter` runs before the agent handler. It tries registered
+patterns against the latest user message; when one matches and its
+callback returns an `AgentResponse`, that response is sent without
+calling the LLM. Otherwise the request falls through to the handler.
+
+Example:
+    ```python
+    from agent_state_bridge.intents import IntentRouter
+    from agent_state_bridge.models import Action, AgentResponse
+
+    intents = IntentRouter()
+
+    @intents.intent(r"delete task (?P<id>\\d+)")
+    def delete_task(match, messages, actions, context):
+        task_id = int(match["id"])
+        if not any(t["id"] == task_id for t in context.get("todos", [])):
+            return None  # Unknown id: let the LLM handle it
+        return AgentResponse(response=f"Deleted task #{task_id}",
+                             actions=[Action(type="delete", payload={"id": task_id})])
+
+    router = create_agent_router(todo_agent, intents=intents)
+    ```
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple, Union
+
+from .metrics import Metrics
+from .models import Action, AgentResponse, Message
+
+# Returns named groups (or any dict of slots) on a match, None otherwise
+Matcher = Callable[[str], Optional[Dict[str, Any]]]
+IntentCallback = Callable[[Dict[str, Any], List[Message], List[Action], Dict[str, Any]], Optional[AgentResponse]]
+
+
+def _regex_matcher(pattern: Union[str, Pattern], flags: int) -> Matcher:
+    compiled = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+
+    def match(text: str) -> Optional[Dict[str, Any]]:
+        m = compiled.fullmatch(text)
+        if m is None:
+            return None
+        slots = m.groupdict()
+        slots.update({i: group for i, group in enumerate(m.groups(), start=1)})
+        return slots
+
+    return match
+
+
+class IntentRouter:
+    """
+    Ordered list of intents tried before the LLM handler.
+
+    Regex patterns must match the whole (stripped) message, which keeps the
+    fast path to confident matches only. Any callable taking the message
+    text and returning a dict of slots (or None) can be used as a grammar.
+    Callbacks receive ``(slots, messages, actions, context)`` and return an
+    `AgentResponse`, or None to fall through to the handler.
+
+    Args:
+        metrics: Metrics collector for ``fast_path.hits`` and
+                 ``fast_path.misses``
+    """
+
+    def __init__(self, metrics: Optional[Metrics] = None):
+        self.metrics = metrics
+        self._intents: List[Tuple[Matcher, IntentCallback]] = []
+
+    def add(
+        self,
+        pattern: Union[str, Pattern, Matcher],
+        callback: IntentCallback,
+        flags: int = re.IGNORECASE,
+    ) -> None:
+        """Register an intent; earlier registrations are tried first"""
+        matcher = pattern if callable(pattern) and not isinstance(pattern, re.Pattern) else _regex_matcher(pattern, flags)
+        self._intents.append((matcher, callback))
+
+    def intent(self, pattern: Union[str, Pattern, Matcher], flags: int = re.IGNORECASE):
+        """Decorator form of `add`"""
+        def decorator(callback: IntentCallback) -> IntentCallback:
+            self.add(pattern, callback, flags)
+            return callback
+        return decorator
+
+    def match(
+        self,
+        messages: List[Message],
+        actions: List[Action],
+        context: Dict[str, Any],
+    ) -> Optional[AgentResponse]:
+        """Response for the latest user message, or None to use the handler"""
+        response = None
+        if messages and messages[-1].role == "user":
+            text = " ".join(messages[-1].content.split())
+            for matcher, callback in self._intents:
+                slots = matcher(text)
+                if slots is None:
+                    continue
+                response = callback(slots, messages, actions, context)
+                if response is not None:
+                    break
+        if self.metrics is not None:
+            self.metrics.incr("fast_path.hits" if response is not None else "fast_path.misses")
+        return response
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of requests answered by the fast path"""
+        return self.metrics.ratio("fast_path.hits", "fast_path.misses") if self.metrics else 0.0
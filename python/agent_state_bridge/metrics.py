@@ -0,0 +1,69 @@
+"""Lightweight in-process metrics for agent-state-bridge"""
+import threading
+from typing import Dict, Optional
+
+
+class Metrics:
+    """
+    Thread-safe counters and gauges collected by the bridge.
+
+    Counters only go up (e.g. ``requests``, ``cancelled``, ``timed_out``);
+    gauges hold the latest observed value (e.g. queue depth). Use
+    `snapshot()` to export them to your monitoring system.
+
+    Example:
+        ```python
+        from agent_state_bridge.metrics import Metrics
+        from agent_state_bridge.fastapi import create_agent_router
+
+        metrics = Metrics()
+        router = create_agent_router(my_agent, metrics=metrics)
+
+        @app.get("/metrics")
+        def read_metrics():
+            return metrics.snapshot()
+        ```
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Increment a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to its latest value"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def counter(self, name: str) -> float:
+        """Current value of a counter (0 if never incremented)"""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def gauge(self, name: str) -> Optional[float]:
+        """Current value of a gauge (None if never set)"""
+        with self._lock:
+            return self._gauges.get(name)
+
+    def ratio(self, hits: str, misses: str) -> float:
+        """Hit rate computed from two counters (0.0 when both are empty)"""
+        with self._lock:
+            h = self._counters.get(hits, 0)
+            m = self._counters.get(misses, 0)
+        return h / (h + m) if h + m else 0.0
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Copy of all counters and gauges"""
+        with self._lock:
+            return {"counters": dict(self._counters), "gauges": dict(self._gauges)}
+
+    def reset(self) -> None:
+        """Clear all counters and gauges"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
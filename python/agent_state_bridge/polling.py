@@ -0,0 +1,247 @@
+"""
+Non-blocking polling for run/thread-style agent backends.
+
+Backends such as Azure AI Agents or the OpenAI Assistants API start a run
+and expect the caller to poll its status. `poll_until` polls one run with
+exponential backoff and jitter; `RunPoller` multiplexes many concurrent
+runs onto a single background task. Both respect the request deadline
+set by the bridge and stop as soon as the waiting handler is cancelled.
+
+Example:
+    ```python
+    from agent_state_bridge.polling import RunPoller
+
+    poller = RunPoller(initial_delay=0.5, max_delay=4)
+
+    async def my_agent(messages, actions, context):
+        run = client.create_run(thread_id=thread.id, assistant_id=agent.id)
+        run = await poller.wait(
+            lambda: client.get_run(thread_id=thread.id, run_id=run.id),
+            lambda r: r.status not in ("queued", "in_progress"),
+        )
+        ...
+    ```
+"""
+import asyncio
+import heapq
+import inspect
+import itertools
+import random
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from .metrics import Metrics
+from .runtime import get_deadline
+
+
+def _backoff(attempt: int, initial_delay: float, max_delay: float, multiplier: float, jitter: float) -> float:
+    """Delay before poll number `attempt + 1`, randomly shortened by up to `jitter`"""
+    delay = min(max_delay, initial_delay * multiplier ** attempt)
+    return delay * (1 - jitter * random.random())
+
+
+def _resolve_deadline(timeout: Optional[float]) -> Optional[float]:
+    """Earlier of `timeout` from now and the current request's deadline"""
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    request_deadline = get_deadline()
+    if request_deadline is not None and (deadline is None or request_deadline < deadline):
+        return request_deadline
+    return deadline
+
+
+async def _call(fetch: Callable[[], Any]) -> Any:
+    """Await async fetches; run blocking ones in a worker thread"""
+    if inspect.iscoroutinefunction(fetch):
+        return await fetch()
+    result = await asyncio.get_running_loop().run_in_executor(None, fetch)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def poll_until(
+    fetch: Callable[[], Any],
+    is_done: Callable[[Any], bool],
+    initial_delay: float = 0.25,
+    max_delay: float = 5.0,
+    multiplier: float = 2.0,
+    jitter: float = 0.2,
+    timeout: Optional[float] = None,
+) -> Any:
+    """
+    Call `fetch` until `is_done(result)` is true and return that result.
+
+    Args:
+        fetch: Sync or async callable returning the current status. Sync
+               callables run in a worker thread so the event loop stays free.
+        is_done: Predicate on the fetched value
+        initial_delay: Seconds before the second poll
+        max_delay: Upper bound for the delay between polls
+        multiplier: Backoff growth factor
+        jitter: Fraction (0-1) by which each delay is randomly shortened
+        timeout: Seconds to wait at most. The current request's deadline
+                 also applies.
+
+    Raises:
+        asyncio.TimeoutError: If the deadline passes first
+    """
+    deadline = _resolve_deadline(timeout)
+    for attempt in itertools.count():
+        result = await _call(fetch)
+        if is_done(result):
+            return result
+        delay = _backoff(attempt, initial_delay, max_delay, multiplier, jitter)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError("Polling deadline exceeded")
+            delay = min(delay, remaining)
+        await asyncio.sleep(delay)
+
+
+class _Run:
+    __slots__ = ("fetch", "is_done", "future", "attempt", "deadline")
+
+    def __init__(self, fetch, is_done, future, deadline):
+        self.fetch = fetch
+        self.is_done = is_done
+        self.future = future
+        self.attempt = 0
+        self.deadline = deadline
+
+
+class RunPoller:
+    """
+    Poll many runs from one background task.
+
+    Each `wait()` registers a run and suspends until it finishes; a single
+    task wakes up when the next poll is due and polls every due run
+    concurrently (at most `max_concurrency` at a time). The task exits when
+    no runs are pending and restarts on the next `wait()`.
+
+    Args:
+        initial_delay, max_delay, multiplier, jitter: Backoff settings, as
+            in `poll_until`
+        max_concurrency: Maximum polls in flight at once
+        metrics: Metrics collector for ``poller.polls`` and ``poller.active``
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = 0.25,
+        max_delay: float = 5.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.2,
+        max_concurrency: int = 16,
+        metrics: Optional[Metrics] = None,
+    ):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_concurrency = max_concurrency
+        self.metrics = metrics
+        self._heap: List[Tuple[float, int, _Run]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        """Runs currently being polled"""
+        return len(self._heap)
+
+    async def wait(
+        self,
+        fetch: Callable[[], Any],
+        is_done: Callable[[Any], bool],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Poll `fetch` until `is_done(result)` and return that result"""
+        loop = asyncio.get_running_loop()
+        run = _Run(fetch, is_done, loop.create_future(), _resolve_deadline(timeout))
+        self._schedule(run, time.monotonic())
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            # Runs left over from a task on another (closed) event loop can't
+            # be resumed from this one
+            self._heap = [entry for entry in self._heap if entry[2].future.get_loop() is loop]
+            heapq.heapify(self._heap)
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._loop())
+        else:
+            self._wakeup.set()
+        return await run.future
+
+    async def close(self) -> None:
+        """Stop the background task and cancel pending waits"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for _, _, run in self._heap:
+            if not run.future.done():
+                run.future.cancel()
+        self._heap.clear()
+
+    def _schedule(self, run: _Run, at: float) -> None:
+        heapq.heappush(self._heap, (at, next(self._seq), run))
+        if self.metrics is not None:
+            self.metrics.set_gauge("poller.active", len(self._heap))
+
+    async def _poll(self, run: _Run, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            if run.future.done():
+                return  # Waiter was cancelled while queued
+            try:
+                result = await _call(run.fetch)
+                done = run.is_done(result)
+            except Exception as e:
+                if not run.future.done():
+                    run.future.set_exception(e)
+                return
+        if self.metrics is not None:
+            self.metrics.incr("poller.polls")
+        if run.future.done():
+            return
+        if done:
+            run.future.set_result(result)
+            return
+        now = time.monotonic()
+        if run.deadline is not None and now >= run.deadline:
+            run.future.set_exception(asyncio.TimeoutError("Polling deadline exceeded"))
+            return
+        delay = _backoff(run.attempt, self.initial_delay, self.max_delay, self.multiplier, self.jitter)
+        run.attempt += 1
+        at = now + delay
+        if run.deadline is not None:
+            at = min(at, run.deadline)
+        self._schedule(run, at)
+
+    async def _loop(self) -> None:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        in_flight = set()
+        while self._heap or in_flight:
+            now = time.monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, run = heapq.heappop(self._heap)
+                if run.future.done():
+                    continue
+                task = asyncio.ensure_future(self._poll(run, semaphore))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            if not self._heap and not in_flight:
+                break  # Every due run had already been cancelled
+            if self.metrics is not None:
+                self.metrics.set_gauge("poller.active", len(self._heap) + len(in_flight))
+
+            self._wakeup.clear()
+            timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+            waiters = [asyncio.ensure_future(self._wakeup.wait()), *in_flight]
+            try:
+                await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waiters[0].cancel()
+        if self.metrics is not None:
+            self.metrics.set_gauge("poller.active", 0)
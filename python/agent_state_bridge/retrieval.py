@@ -0,0 +1,283 @@
+"""In-process vector retrieval over context collections"""
+import hashlib
+import json
+import os
+import re
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("NumPy is required. Install with: pip install agent-state-bridge[retrieval]")
+
+from .models import Message
+
+
+class Embedder(Protocol):
+    """Turns texts into a ``(len(texts), dim)`` float32 array of unit vectors"""
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        ...
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """
+    Deterministic embedder based on feature hashing.
+
+    Needs no model or network access, so it is suitable for tests, offline
+    development and small catalogs where keyword overlap is good enough.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _features(self, text: str) -> Iterable[str]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        yield from tokens
+        for a, b in zip(tokens, tokens[1:]):
+            yield f"{a} {b}"
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                out[row, (value >> 1) % self.dim] += sign
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+class VectorIndex:
+    """
+    NumPy-backed vector index keyed by item id.
+
+    When `path` is given, vectors are persisted to a ``<path>.<id>.npy``
+    file and loaded back memory-mapped, so a warm start does not re-read or
+    re-embed anything. Keys, content hashes and the name of the current
+    vectors file are stored in ``<path>.json``; replacing it is the single
+    step that commits a save, so concurrent writers never leave keys and
+    vectors from different saves side by side.
+    """
+
+    def __init__(self, dim: int, path: Optional[str] = None):
+        self.dim = dim
+        self.path = path
+        self._keys: List[str] = []
+        self._hashes: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._vectors_file: Optional[str] = None
+        if path and os.path.exists(path + ".json"):
+            self._load()
+
+    def _load(self) -> None:
+        with open(self.path + ".json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        directory, name = os.path.split(self.path)
+        vectors_file = meta.get("vectors", name + ".npy")
+        try:
+            vectors = np.load(os.path.join(directory, vectors_file), mmap_mode="c")
+        except FileNotFoundError:
+            return  # Removed by a newer save: start empty and rebuild
+        if meta.get("dim") != self.dim or vectors.shape != (len(meta["keys"]), self.dim):
+            return  # Stale or foreign file: start empty and rebuild
+        self._keys = list(meta["keys"])
+        self._hashes = list(meta["hashes"])
+        self._positions = {key: i for i, key in enumerate(self._keys)}
+        self._vectors = vectors
+        self._vectors_file = vectors_file
+
+    def save(self) -> None:
+        """Write vectors and metadata to `path` (atomically replaces the previous save)"""
+        if not self.path:
+            raise ValueError("VectorIndex has no path to save to")
+        directory, name = os.path.split(self.path)
+        save_id = uuid.uuid4().hex[:16]
+        vectors_file = f"{name}.{save_id}.npy"
+        np.save(os.path.join(directory, vectors_file), np.ascontiguousarray(self._vectors))
+        tmp = f"{self.path}.{save_id}.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "keys": self._keys, "hashes": self._hashes, "vectors": vectors_file}, f)
+        os.replace(tmp, self.path + ".json")
+        previous, self._vectors_file = self._vectors_file, vectors_file
+        if previous:
+            try:
+                os.remove(os.path.join(directory, previous))
+            except OSError:
+                pass
+
+    def content_hash(self, key: str) -> Optional[str]:
+        """Stored content hash for `key`, or None if not indexed"""
+        pos = self._positions.get(key)
+        return self._hashes[pos] if pos is not None else None
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def upsert(self, keys: Sequence[str], vectors: "np.ndarray", hashes: Sequence[str]) -> None:
+        """Insert or replace vectors; for a key given twice, the last one wins"""
+        batch = {key: (vector, content_hash) for key, vector, content_hash in zip(keys, vectors, hashes)}
+        index_keys = list(self._keys)
+        index_hashes = list(self._hashes)
+        positions = dict(self._positions)
+        new_rows, updates = [], []
+        for key, (vector, content_hash) in batch.items():
+            pos = positions.get(key)
+            if pos is None:
+                positions[key] = len(index_keys)
+                index_keys.append(key)
+                index_hashes.append(content_hash)
+                new_rows.append(vector)
+            else:
+                index_hashes[pos] = content_hash
+                updates.append((pos, vector))
+        if new_rows:
+            matrix = np.vstack([self._vectors, np.asarray(new_rows, dtype=np.float32)])
+        elif updates:
+            matrix = np.array(self._vectors)
+        else:
+            return
+        for pos, vector in updates:
+            matrix[pos] = vector
+        # Swap in the new state only once it is complete
+        self._vectors = matrix
+        self._keys = index_keys
+        self._hashes = index_hashes
+        self._positions = positions
+
+    def remove(self, keys: Iterable[str]) -> None:
+        """Drop vectors for `keys` (unknown keys are ignored)"""
+        drop = {self._positions[key] for key in keys if key in self._positions}
+        if not drop:
+            return
+        keep = [i for i in range(len(self._keys)) if i not in drop]
+        self._vectors = np.asarray(self._vectors[keep], dtype=np.float32)
+        self._keys = [self._keys[i] for i in keep]
+        self._hashes = [self._hashes[i] for i in keep]
+        self._positions = {key: i for i, key in enumerate(self._keys)}
+
+    def search(self, query: "np.ndarray", k: int) -> List[Tuple[str, float]]:
+        """Top-`k` ``(key, score)`` pairs by cosine similarity"""
+        n = len(self._keys)
+        if n == 0 or k <= 0:
+            return []
+        scores = self._vectors @ np.asarray(query, dtype=np.float32)
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._keys[i], float(scores[i])) for i in top]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class ContextRetriever:
+    """
+    Select the items of a context collection most relevant to the latest message.
+
+    Items are embedded once and re-embedded only when their content hash
+    changes. Use `narrow()` to shrink the collection before building a
+    prompt, so prompt size no longer grows with catalog size.
+
+    Example:
+        ```python
+        from agent_state_bridge.retrieval import ContextRetriever
+
+        products = ContextRetriever("products", fields=["name", "category"], top_k=5,
+                                    path="/var/cache/agent/products")
+
+        async def shopping_agent(messages, actions, context):
+            context = products.narrow(messages, context)
+            # context["products"] now holds the 5 most relevant products
+            ...
+        ```
+    """
+
+    def __init__(
+        self,
+        collection: str,
+        fields: Optional[Sequence[str]] = None,
+        key: str = "id",
+        embedder: Optional[Embedder] = None,
+        top_k: int = 5,
+        path: Optional[str] = None,
+    ):
+        self.collection = collection
+        self.fields = list(fields) if fields else None
+        self.key = key
+        self.embedder = embedder or HashingEmbedder()
+        self.top_k = top_k
+        self.index = VectorIndex(self.embedder.dim, path)
+
+    def item_text(self, item: Dict[str, Any]) -> str:
+        """Text that is embedded for an item"""
+        if self.fields:
+            return " ".join(str(item[f]) for f in self.fields if item.get(f) is not None)
+        return json.dumps(item, sort_keys=True, default=str)
+
+    def item_key(self, item: Dict[str, Any], text: str) -> str:
+        value = item.get(self.key)
+        return str(value) if value is not None else hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _prepare(self, items: Sequence[Dict[str, Any]]) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """``(key, text, item)`` per distinct key; for duplicate keys the last item wins"""
+        prepared: Dict[str, Tuple[str, str, Dict[str, Any]]] = {}
+        for item in items:
+            text = self.item_text(item)
+            key = self.item_key(item, text)
+            prepared[key] = (key, text, item)
+        return list(prepared.values())
+
+    def _sync(self, prepared: List[Tuple[str, str, Dict[str, Any]]]) -> int:
+        keys, texts, hashes = [], [], []
+        for key, text, _ in prepared:
+            content_hash = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+            if self.index.content_hash(key) != content_hash:
+                keys.append(key)
+                texts.append(text)
+                hashes.append(content_hash)
+        if keys:
+            self.index.upsert(keys, self.embedder.embed(texts), hashes)
+        seen = {key for key, _, _ in prepared}
+        stale = [key for key in self.index.keys() if key not in seen]
+        self.index.remove(stale)
+        if self.index.path and (keys or stale):
+            self.index.save()
+        return len(keys)
+
+    def sync(self, items: Sequence[Dict[str, Any]]) -> int:
+        """
+        Bring the index in line with `items`.
+
+        Only new or changed items are embedded; items no longer present are
+        removed. Returns the number of items embedded.
+        """
+        return self._sync(self._prepare(items))
+
+    def retrieve(self, messages: List[Message], context: Dict[str, Any], k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Top-k items of the collection for the latest message"""
+        items = context.get(self.collection) or []
+        if not messages or not items:
+            return list(items)
+        prepared = self._prepare(items)
+        self._sync(prepared)
+        by_key = {key: item for key, _, item in prepared}
+        query = self.embedder.embed([messages[-1].content])[0]
+        hits = self.index.search(query, k or self.top_k)
+        return [by_key[key] for key, _ in hits if key in by_key]
+
+    def narrow(self, messages: List[Message], context: Dict[str, Any], k: Optional[int] = None) -> Dict[str, Any]:
+        """Copy of `context` with the collection replaced by its top-k items"""
+        if self.collection not in context:
+            return context
+        narrowed = dict(context)
+        narrowed[self.collection] = self.retrieve(messages, context, k)
+        return narrowed
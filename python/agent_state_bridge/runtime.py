@@ -0,0 +1,112 @@
+"""
+Request-scoped runtime state for agent handlers.
+
+The bridge sets a scope for every `/chat` request so handlers can reach
+per-request information without changing their
+``(messages, actions, context)`` signature.
+
+Example:
+    ```python
+    from agent_state_bridge.runtime import remaining_time
+
+    async def my_agent(messages, actions, context):
+        budget = remaining_time()  # seconds left, or None if no deadline
+        reply = await llm.ainvoke(prompt, timeout=budget)
+        return AgentResponse(response=reply.content)
+    ```
+"""
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
+
+from .metrics import Metrics
+
+if TYPE_CHECKING:
+    import httpx
+    from .clients import HTTPClientPool
+    from .store import Store
+    from .tasks import BackgroundQueue
+
+
+class RequestScope:
+    """State shared between the bridge and the handler for one request"""
+
+    __slots__ = ("deadline", "metrics", "store", "http", "tasks", "deferred")
+
+    def __init__(
+        self,
+        deadline: Optional[float] = None,
+        metrics: Optional[Metrics] = None,
+        store: Optional["Store"] = None,
+        http: Optional["HTTPClientPool"] = None,
+        tasks: Optional["BackgroundQueue"] = None,
+    ):
+        self.deadline = deadline
+        self.metrics = metrics
+        self.store = store
+        self.http = http
+        self.tasks = tasks
+        self.deferred: List[Tuple[Callable[..., Any], tuple, dict]] = []
+
+    def child(self) -> "RequestScope":
+        """Scope for one backend call: same resources, its own deferred jobs"""
+        return RequestScope(self.deadline, self.metrics, self.store, self.http, self.tasks)
+
+
+_scope: ContextVar[Optional[RequestScope]] = ContextVar("agent_state_bridge_scope", default=None)
+
+
+def current_scope() -> Optional[RequestScope]:
+    """Scope of the request being handled, or None outside a request"""
+    return _scope.get()
+
+
+def enter_scope(scope: RequestScope):
+    """Activate a scope; returns a token for `exit_scope`"""
+    return _scope.set(scope)
+
+
+def exit_scope(token) -> None:
+    """Restore the scope that was active before `enter_scope`"""
+    _scope.reset(token)
+
+
+def get_deadline() -> Optional[float]:
+    """Absolute deadline (``time.monotonic()`` clock) for the current request"""
+    scope = _scope.get()
+    return scope.deadline if scope else None
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current request's deadline (never negative)"""
+    deadline = get_deadline()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def get_store() -> Optional["Store"]:
+    """Shared session/cache store configured on the bridge, if any"""
+    scope = _scope.get()
+    return scope.store if scope else None
+
+
+def get_http_client(base_url: Optional[str] = None) -> "httpx.AsyncClient":
+    """Pooled HTTP client for `base_url` from the bridge's `HTTPClientPool`"""
+    scope = _scope.get()
+    if scope is None or scope.http is None:
+        raise RuntimeError("No HTTPClientPool configured. Pass http=HTTPClientPool(...) to the bridge")
+    return scope.http.client(base_url)
+
+
+def defer(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """
+    Run `fn(*args, **kwargs)` on the bridge's `BackgroundQueue` after the
+    response has been sent. Deferred work is discarded if the handler fails,
+    and with several backends only the jobs of the responses that are used
+    (the winner, or every merged `FanOut` backend) are kept.
+    """
+    scope = _scope.get()
+    if scope is None or scope.tasks is None:
+        raise RuntimeError("No BackgroundQueue configured. Pass tasks=BackgroundQueue(...) to the bridge")
+    scope.deferred.append((fn, args, kwargs))
@@ -0,0 +1,595 @@
+"""
+Shared session and cache stores for multi-worker deployments.
+
+Every backend implements the same `Store` interface, so session history,
+context snapshots or response caches can be shared by all uvicorn/gunicorn
+workers instead of being fragmented per process:
+
+- `SQLiteStore`: a local SQLite database in WAL mode (any number of
+  processes on one host)
+- `SharedMemoryStore`: a fixed-size hash table in POSIX shared memory
+  (single-host multi-worker, no disk I/O)
+- `RedisStore`: any Redis-compatible client (multi-host)
+
+Writes are buffered and flushed in batches by a background thread
+(write-behind); reads see the process's own pending writes immediately.
+Entries expire by TTL and backends evict the oldest entries when full.
+
+Stores may be created before the server forks its workers (gunicorn
+``--preload``): each child drops the parent's pending writes and flusher
+thread, and opens its own database connection or lock file on first use.
+"""
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from .metrics import Metrics
+
+# (key, encoded value or None for a delete, absolute expiry or None)
+Write = Tuple[str, Optional[bytes], Optional[float]]
+
+_MISSING = object()
+
+_stores: "weakref.WeakSet[Store]" = weakref.WeakSet()
+
+
+def _reset_stores_after_fork() -> None:
+    for store in list(_stores):
+        store._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_stores_after_fork)
+
+
+class Store(ABC):
+    """
+    Base class for key/value stores with write-behind and TTL.
+
+    Values must be JSON-serializable. Subclasses implement `_read`,
+    `_write_batch` and `_clear`.
+
+    Args:
+        default_ttl: Seconds an entry lives when `set` gets no ttl
+                     (default: no expiry)
+        write_behind: Buffer writes and flush them in batches from a
+                      background thread (default: True)
+        flush_interval: Seconds between background flushes
+        max_pending: Flush early once this many writes are buffered
+        metrics: Metrics collector for hits, misses, writes and evictions
+        name: Metric name prefix (default: "store")
+    """
+
+    def __init__(
+        self,
+        default_ttl: Optional[float] = None,
+        write_behind: bool = True,
+        flush_interval: float = 0.05,
+        max_pending: int = 256,
+        metrics: Optional[Metrics] = None,
+        name: str = "store",
+    ):
+        self.default_ttl = default_ttl
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.metrics = metrics
+        self.name = name
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[Optional[bytes], Optional[float]]] = {}
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        self._hits = 0
+        self._misses = 0
+        _stores.add(self)
+
+    # -- backend hooks -------------------------------------------------
+
+    @abstractmethod
+    def _read(self, key: str) -> Optional[bytes]:
+        """Encoded value for `key`, or None if missing or expired"""
+
+    @abstractmethod
+    def _write_batch(self, writes: List[Write]) -> None:
+        """Apply a batch of sets and deletes"""
+
+    @abstractmethod
+    def _clear(self) -> None:
+        """Remove every entry"""
+
+    def _close(self) -> None:
+        """Release backend resources"""
+
+    def _after_fork(self) -> None:
+        """Reset per-process state in a forked child (the parent flushes its own writes)"""
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._wake = threading.Event()
+        self._flusher = None
+        self._hits = 0
+        self._misses = 0
+
+    # -- public API ----------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value for `key`, or `default` if missing or expired"""
+        with self._lock:
+            pending = self._pending.get(key, _MISSING)
+        if pending is not _MISSING:
+            data, expires_at = pending
+            if data is not None and (expires_at is None or expires_at > time.time()):
+                return self._hit(data)
+            return self._miss(default)
+        data = self._read(key)
+        return self._hit(data) if data is not None else self._miss(default)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store `value` under `key` for `ttl` seconds (default: `default_ttl`)"""
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        self._submit(key, data, expires_at)
+        self._incr("writes")
+
+    def delete(self, key: str) -> None:
+        """Remove `key` (no error if missing)"""
+        self._submit(key, None, None)
+
+    def clear(self) -> None:
+        """Remove every entry, including pending writes"""
+        with self._lock:
+            self._pending.clear()
+        self._clear()
+
+    def flush(self) -> None:
+        """Write all pending changes to the backend now"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+        try:
+            self._write_batch([(key, data, expires_at) for key, (data, expires_at) in pending.items()])
+        except Exception:
+            # Put the batch back for the next flush, keeping any newer writes
+            with self._lock:
+                for key, value in pending.items():
+                    self._pending.setdefault(key, value)
+                remaining = len(self._pending)
+            self._gauge("pending", remaining)
+            raise
+        with self._lock:
+            remaining = len(self._pending)
+        self._gauge("pending", remaining)
+
+    def close(self) -> None:
+        """Flush pending writes, stop the background thread and release resources"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stopped.set()
+        self._wake.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        self.flush()
+        self._close()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of `get` calls served from the store"""
+        total = self._hits + self._misses
+        return self._hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Hits, misses, hit rate and pending writes for this process"""
+        with self._lock:
+            pending = len(self._pending)
+        return {"hits": self._hits, "misses": self._misses, "hit_rate": self.hit_rate, "pending": pending}
+
+    # -- internals -----------------------------------------------------
+
+    def _hit(self, data: bytes) -> Any:
+        self._hits += 1
+        self._incr("hits")
+        return json.loads(data)
+
+    def _miss(self, default: Any) -> Any:
+        self._misses += 1
+        self._incr("misses")
+        return default
+
+    def _incr(self, what: str, value: float = 1) -> None:
+        if self.metrics is not None:
+            self.metrics.incr(f"{self.name}.{what}", value)
+
+    def _gauge(self, what: str, value: float) -> None:
+        if self.metrics is not None:
+            self.metrics.set_gauge(f"{self.name}.{what}", value)
+
+    def _submit(self, key: str, data: Optional[bytes], expires_at: Optional[float]) -> None:
+        if not self.write_behind or self._stopped.is_set():
+            self._write_batch([(key, data, expires_at)])
+            return
+        with self._lock:
+            self._pending[key] = (data, expires_at)
+            pending = len(self._pending)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name=f"{self.name}-flusher", daemon=True)
+                self._flusher.start()
+                atexit.register(self.close)
+        self._gauge("pending", pending)
+        if pending >= self.max_pending:
+            self._wake.set()
+
+    def _flush_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                self._incr("flush_errors")
+
+
+class SQLiteStore(Store):
+    """
+    Store backed by a local SQLite database in WAL mode.
+
+    All workers on a host can share one database file. Expired entries are
+    purged on flush, and the oldest entries are evicted once `max_entries`
+    is exceeded. Writes go through one connection per process; each thread
+    reads through its own read-only connection, so lookups never wait for
+    a flush in progress.
+
+    Example:
+        ```python
+        from agent_state_bridge.store import SQLiteStore
+
+        store = SQLiteStore("/var/lib/agent/sessions.db", default_ttl=3600, max_entries=100_000)
+        bridge = AgentBridge(store=store, metrics=metrics)
+        ```
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.max_entries = max_entries
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        # Connections inherited across fork must not be used or closed in the child
+        self._inherited: List[sqlite3.Connection] = []
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS kv_updated_at ON kv (updated_at)")
+
+    @contextmanager
+    def _connection(self):
+        """This process's connection, opened on first use, held under the thread lock"""
+        with self._db_lock:
+            if self._conn_pid != os.getpid():
+                if self._conn is not None:
+                    self._inherited.append(self._conn)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn_pid = os.getpid()
+            yield self._conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """This thread's read-only connection, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def _after_fork(self) -> None:
+        super()._after_fork()
+        self._db_lock = threading.Lock()
+        self._readers_lock = threading.Lock()
+        self._inherited.extend(self._readers)
+        self._readers = []
+        self._local = threading.local()
+
+    def _read(self, key: str) -> Optional[bytes]:
+        row = self._reader().execute("SELECT value, expires_at FROM kv WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return row[0]
+
+    def _write_batch(self, writes: List[Write]) -> None:
+        now = time.time()
+        upserts = [(key, data, expires_at, now) for key, data, expires_at in writes if data is not None]
+        deletes = [(key,) for key, data, _ in writes if data is None]
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if upserts:
+                    conn.executemany(
+                        "INSERT INTO kv (key, value, expires_at, updated_at) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                        "expires_at = excluded.expires_at, updated_at = excluded.updated_at",
+                        upserts,
+                    )
+                if deletes:
+                    conn.executemany("DELETE FROM kv WHERE key = ?", deletes)
+                evicted = conn.execute(
+                    "DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+                ).rowcount
+                if self.max_entries is not None:
+                    (count,) = conn.execute("SELECT COUNT(*) FROM kv").fetchone()
+                    if count > self.max_entries:
+                        evicted += conn.execute(
+                            "DELETE FROM kv WHERE key IN (SELECT key FROM kv ORDER BY updated_at LIMIT ?)",
+                            (count - self.max_entries,),
+                        ).rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        if evicted:
+            self._incr("evictions", evicted)
+
+    def _clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM kv")
+
+    def _close(self) -> None:
+        with self._db_lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+            self._local = threading.local()
+        for conn in readers:
+            conn.close()
+
+
+class SharedMemoryStore(Store):
+    """
+    Store backed by a fixed-size hash table in POSIX shared memory.
+
+    Workers on the same host attach to the segment by `name`; the first one
+    creates it. Capacity is `slots` entries of at most `slot_size` bytes
+    (key, value and a 34-byte header). When a key's probe window is full,
+    the least recently written entry in it is evicted. Access is serialized
+    with a lock file next to the segment. The segment outlives the workers;
+    call `unlink()` to remove it.
+
+    Example:
+        ```python
+        from agent_state_bridge.store import SharedMemoryStore
+
+        cache = SharedMemoryStore("agent-cache", slots=16384, slot_size=2048, default_ttl=300)
+        ```
+    """
+
+    _MAGIC = b"ASB1"
+    _HEADER = struct.Struct("<4sII")
+    _SLOT = struct.Struct("<B3xQddHI")  # state, key hash, expires_at, written_at, key len, value len
+    _EMPTY, _USED, _DELETED = 0, 1, 2
+
+    def __init__(self, name: str, slots: int = 4096, slot_size: int = 1024, max_probe: int = 16, **kwargs):
+        super().__init__(**kwargs)
+        try:
+            import fcntl
+            from multiprocessing import shared_memory
+        except ImportError:
+            raise ImportError("SharedMemoryStore requires a POSIX platform")
+        self._fcntl = fcntl
+        self.shm_name = name
+        self.max_probe = min(max_probe, slots)
+        self._thread_lock = threading.Lock()
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock_file = None
+        self._lock_pid: Optional[int] = None
+
+        size = self._HEADER.size + slots * slot_size
+        with self._locked():
+            try:
+                self._shm = self._open_shm(shared_memory, name, create=True, size=size)
+                self._HEADER.pack_into(self._shm.buf, 0, self._MAGIC, slots, slot_size)
+            except FileExistsError:
+                self._shm = self._open_shm(shared_memory, name, create=False)
+        magic, self.slots, self.slot_size = self._HEADER.unpack_from(self._shm.buf, 0)
+        if magic != self._MAGIC:
+            raise ValueError(f"Shared memory segment {name!r} is not a SharedMemoryStore")
+
+    def _open_shm(self, shared_memory, name: str, create: bool, size: int = 0):
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+            self._untracked_manually = False
+            return shm
+        except TypeError:
+            # Python < 3.13: stop the resource tracker from unlinking the
+            # segment when this worker exits
+            from multiprocessing import resource_tracker
+            shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+            resource_tracker.unregister(shm._name, "shared_memory")
+            self._untracked_manually = True
+            return shm
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive access across threads and processes"""
+        with self._thread_lock:
+            if self._lock_pid != os.getpid():
+                # flock only excludes separate open file descriptions, so a
+                # file opened before a fork would not lock between workers
+                if self._lock_file is not None:
+                    self._lock_file.close()
+                self._lock_file = open(self._lock_path, "a+b")
+                self._lock_pid = os.getpid()
+            self._fcntl.flock(self._lock_file, self._fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                self._fcntl.flock(self._lock_file, self._fcntl.LOCK_UN)
+
+    def _after_fork(self) -> None:
+        super()._after_fork()
+        self._thread_lock = threading.Lock()
+
+    @staticmethod
+    def _hash(key: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+    def _offset(self, slot: int) -> int:
+        return self._HEADER.size + slot * self.slot_size
+
+    def _find(self, key: bytes, key_hash: int, now: float):
+        """(slot holding `key` or None, best free slot or None, oldest used slot)"""
+        buf = self._shm.buf
+        found = free = oldest = None
+        oldest_written = None
+        start = key_hash % self.slots
+        for i in range(self.max_probe):
+            slot = (start + i) % self.slots
+            off = self._offset(slot)
+            state, h, expires_at, written_at, key_len, _ = self._SLOT.unpack_from(buf, off)
+            if state == self._EMPTY:
+                if free is None:
+                    free = slot
+                break
+            expired = state == self._USED and expires_at and expires_at <= now
+            if state == self._USED and h == key_hash:
+                start_key = off + self._SLOT.size
+                if bytes(buf[start_key:start_key + key_len]) == key:
+                    found = slot
+                    break
+            if (state == self._DELETED or expired) and free is None:
+                free = slot
+            if state == self._USED and (oldest_written is None or written_at < oldest_written):
+                oldest, oldest_written = slot, written_at
+        return found, free, oldest
+
+    def _read(self, key: str) -> Optional[bytes]:
+        raw = key.encode("utf-8")
+        with self._locked():
+            slot, _, _ = self._find(raw, self._hash(raw), time.time())
+            if slot is None:
+                return None
+            off = self._offset(slot)
+            _, _, expires_at, _, key_len, value_len = self._SLOT.unpack_from(self._shm.buf, off)
+            if expires_at and expires_at <= time.time():
+                return None
+            start = off + self._SLOT.size + key_len
+            return bytes(self._shm.buf[start:start + value_len])
+
+    def _write_batch(self, writes: List[Write]) -> None:
+        evicted = 0
+        with self._locked():
+            now = time.time()
+            for key, data, expires_at in writes:
+                raw = key.encode("utf-8")
+                key_hash = self._hash(raw)
+                found, free, oldest = self._find(raw, key_hash, now)
+                if data is None:
+                    if found is not None:
+                        self._SLOT.pack_into(self._shm.buf, self._offset(found), self._DELETED, 0, 0, 0, 0, 0)
+                    continue
+                if self._SLOT.size + len(raw) + len(data) > self.slot_size:
+                    self._incr("oversized")
+                    continue
+                slot = found if found is not None else free
+                if slot is None:
+                    slot = oldest
+                    evicted += 1
+                off = self._offset(slot)
+                self._SLOT.pack_into(
+                    self._shm.buf, off, self._USED, key_hash, expires_at or 0.0, now, len(raw), len(data)
+                )
+                start = off + self._SLOT.size
+                self._shm.buf[start:start + len(raw)] = raw
+                self._shm.buf[start + len(raw):start + len(raw) + len(data)] = data
+        if evicted:
+            self._incr("evictions", evicted)
+
+    def _clear(self) -> None:
+        with self._locked():
+            end = self._offset(self.slots)
+            self._shm.buf[self._HEADER.size:end] = bytes(end - self._HEADER.size)
+
+    def _close(self) -> None:
+        self._shm.close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def unlink(self) -> None:
+        """Destroy the shared memory segment for all workers"""
+        if self._untracked_manually:
+            # Balance the earlier unregister, which unlink() repeats
+            from multiprocessing import resource_tracker
+            resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+
+
+class RedisStore(Store):
+    """
+    Store backed by a Redis-compatible client.
+
+    Works with `redis.Redis` or any object offering ``get``, ``set(key,
+    value, px=...)``, ``delete`` and optionally ``pipeline()`` and
+    ``scan_iter``. Batches are sent as one pipeline. TTLs use Redis
+    expiry; size eviction is left to the server's ``maxmemory`` policy.
+
+    Example:
+        ```python
+        import redis
+        from agent_state_bridge.store import RedisStore
+
+        store = RedisStore(redis.Redis(host="cache"), prefix="agent:", default_ttl=3600)
+        ```
+    """
+
+    def __init__(self, client, prefix: str = "agent-state-bridge:", **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+        self.prefix = prefix
+
+    def _read(self, key: str) -> Optional[bytes]:
+        data = self.client.get(self.prefix + key)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return data
+
+    def _write_batch(self, writes: List[Write]) -> None:
+        target = self.client.pipeline() if hasattr(self.client, "pipeline") else self.client
+        now = time.time()
+        for key, data, expires_at in writes:
+            if data is None:
+                target.delete(self.prefix + key)
+            elif expires_at is None:
+                target.set(self.prefix + key, data)
+            else:
+                target.set(self.prefix + key, data, px=max(1, int((expires_at - now) * 1000)))
+        if target is not self.client:
+            target.execute()
+
+    def _clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
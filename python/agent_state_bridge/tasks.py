@@ -0,0 +1,133 @@
+"""
+Bounded background queue for post-response work.
+
+Analytics logging, conversation persistence or cache warming don't affect
+the reply, so they shouldn't add to `/chat` latency, and spawning an
+untracked task per request lets them pile up under load. Handlers call
+`agent_state_bridge.runtime.defer()` instead; the bridge enqueues the work
+once the `AgentResponse` has been sent and a fixed pool of workers runs it.
+
+Example:
+    ```python
+    from agent_state_bridge.fastapi import AgentBridge
+    from agent_state_bridge.runtime import defer
+    from agent_state_bridge.tasks import BackgroundQueue
+
+    bridge = AgentBridge(tasks=BackgroundQueue(maxsize=1000, workers=4, policy="drop"))
+
+    @bridge.agent_handler
+    async def my_agent(messages, actions, context):
+        reply = ...
+        defer(save_conversation, messages, reply)
+        return AgentResponse(response=reply)
+    ```
+"""
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from .metrics import Metrics
+
+Job = Tuple[float, Callable[..., Any], tuple, dict]
+
+
+class BackgroundQueue:
+    """
+    Bounded queue of background jobs served by a fixed number of workers.
+
+    Jobs are sync or async callables; sync ones run in a worker thread.
+
+    Args:
+        maxsize: Maximum number of queued jobs
+        workers: Number of concurrent workers
+        policy: What `submit` does when the queue is full: ``"drop"`` the
+                job or ``"block"`` until there is room
+        metrics: Metrics collector for ``tasks.depth`` and ``tasks.lag``
+                 (seconds a job waited) gauges, and ``tasks.completed``,
+                 ``tasks.failed`` and ``tasks.dropped`` counters
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        workers: int = 4,
+        policy: str = "drop",
+        metrics: Optional[Metrics] = None,
+    ):
+        if policy not in ("drop", "block"):
+            raise ValueError("policy must be 'drop' or 'block'")
+        self.maxsize = maxsize
+        self.workers = workers
+        self.policy = policy
+        self.metrics = metrics
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        """Jobs waiting to run"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        """Start the workers (done automatically on first submit)"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    async def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> bool:
+        """Queue `fn(*args, **kwargs)`; returns False if it was dropped"""
+        await self.start()
+        job = (time.monotonic(), fn, args, kwargs)
+        if self.policy == "block":
+            await self._queue.put(job)
+        else:
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                self._incr("tasks.dropped")
+                return False
+        self._gauge("tasks.depth", self._queue.qsize())
+        return True
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """Wait for queued jobs to finish (up to `timeout`), then stop the workers"""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            self._incr("tasks.dropped", self._queue.qsize())
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._gauge("tasks.depth", 0)
+
+    async def _work(self) -> None:
+        while True:
+            enqueued_at, fn, args, kwargs = await self._queue.get()
+            self._gauge("tasks.lag", time.monotonic() - enqueued_at)
+            self._gauge("tasks.depth", self._queue.qsize())
+            try:
+                if inspect.iscoroutinefunction(fn):
+                    await fn(*args, **kwargs)
+                else:
+                    await asyncio.get_running_loop().run_in_executor(None, lambda: fn(*args, **kwargs))
+                self._incr("tasks.completed")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._incr("tasks.failed")
+            finally:
+                self._queue.task_done()
+
+    def _incr(self, name: str, value: float = 1) -> None:
+        if self.metrics is not None:
+            self.metrics.incr(name, value)
+
+    def _gauge(self, name: str, value: float) -> None:
+        if self.metrics is not None:
+            self.metrics.set_gauge(name, value)
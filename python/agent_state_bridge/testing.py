@@ -0,0 +1,124 @@
+"""
+Test helpers for agent-state-bridge.
+
+`InMemoryRedis` is a small in-process stand-in for a Redis client, so code
+using `RedisStore` can be exercised without a Redis server:
+
+    ```python
+    from agent_state_bridge.store import RedisStore
+    from agent_state_bridge.testing import InMemoryRedis
+
+    store = RedisStore(InMemoryRedis(max_keys=1000), default_ttl=60)
+    ```
+"""
+import fnmatch
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+
+Value = Union[bytes, str, int, float]
+
+
+def _encode(value: Value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf-8")
+
+
+class InMemoryRedis:
+    """
+    In-process stand-in for the subset of the Redis client API that
+    `RedisStore` uses: ``get``, ``set`` (with ``ex``/``px``), ``delete``,
+    ``scan_iter`` and ``pipeline``.
+
+    Args:
+        max_keys: Evict the least recently used key beyond this many keys,
+                  like a server with ``maxmemory-policy allkeys-lru``
+                  (default: unbounded)
+        clock: Time source for expiry, in seconds (default:
+               `time.monotonic`); tests can pass a fake clock
+    """
+
+    def __init__(self, max_keys: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self.evicted = 0
+        self._data: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _live(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= self.clock():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: Value, ex: Optional[float] = None, px: Optional[int] = None) -> bool:
+        expires_at = None
+        if px is not None:
+            expires_at = self.clock() + px / 1000
+        elif ex is not None:
+            expires_at = self.clock() + ex
+        with self._lock:
+            self._data[key] = (_encode(value), expires_at)
+            self._data.move_to_end(key)
+            while self.max_keys is not None and len(self._data) > self.max_keys:
+                self._data.popitem(last=False)
+                self.evicted += 1
+        return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def ttl(self, key: str) -> int:
+        """Seconds to live: -2 if missing, -1 if the key has no expiry"""
+        with self._lock:
+            entry = self._live(key)
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return max(0, round(entry[1] - self.clock()))
+
+    def scan_iter(self, match: str = "*") -> Iterator[str]:
+        with self._lock:
+            keys = [key for key in list(self._data) if self._live(key) is not None]
+        return iter([key for key in keys if fnmatch.fnmatchcase(key, match)])
+
+    def pipeline(self) -> "_Pipeline":
+        return _Pipeline(self)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(self._live(key) is not None for key in list(self._data))
+
+
+class _Pipeline:
+    """Buffers commands and applies them in one step on `execute`"""
+
+    def __init__(self, client: InMemoryRedis):
+        self._client = client
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def set(self, *args: Any, **kwargs: Any) -> "_Pipeline":
+        self._commands.append(("set", args, kwargs))
+        return self
+
+    def delete(self, *args: Any) -> "_Pipeline":
+        self._commands.append(("delete", args, {}))
+        return self
+
+    def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        with self._client._lock:
+            return [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in commands]
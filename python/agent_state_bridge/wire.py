@@ -0,0 +1,90 @@
+"""
+Wire formats for `/chat`: JSON (default) and MessagePack.
+
+Clients opt in per request: a body sent with ``Content-Type:
+application/msgpack`` is decoded as MessagePack, and ``Accept:
+application/msgpack`` asks for a MessagePack response. Each integration
+reads the same payload it would read from JSON. Requires the ``msgpack``
+extra (``pip install agent-state-bridge[msgpack]``).
+"""
+import importlib.util
+from functools import lru_cache
+from typing import Any, Optional
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack", "application/vnd.msgpack")
+
+
+def _import_msgpack():
+    """Return the msgpack module"""
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("msgpack is required. Install with: pip install agent-state-bridge[msgpack]")
+    return msgpack
+
+
+@lru_cache(maxsize=None)
+def msgpack_available() -> bool:
+    """True if the msgpack package is installed"""
+    return importlib.util.find_spec("msgpack") is not None
+
+
+def _media_type(value: str) -> str:
+    return value.split(";", 1)[0].strip().lower()
+
+
+def is_msgpack(content_type: Optional[str]) -> bool:
+    """True if a Content-Type header names MessagePack"""
+    return bool(content_type) and _media_type(content_type) in MSGPACK_TYPES
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    """
+    True if an Accept header prefers MessagePack to JSON.
+
+    The higher quality value wins; on a tie, the type listed first.
+    Wildcards count as JSON, so ``*/*`` keeps the JSON default.
+    """
+    if not accept:
+        return False
+    best_msgpack = best_json = None
+    for index, item in enumerate(accept.split(",")):
+        media_type, *params = item.split(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q <= 0:
+            continue
+        rank = (q, -index)
+        if media_type in MSGPACK_TYPES:
+            best_msgpack = max(best_msgpack or rank, rank)
+        elif media_type in (JSON, "application/*", "*/*"):
+            best_json = max(best_json or rank, rank)
+    return best_msgpack is not None and (best_json is None or best_msgpack > best_json)
+
+
+def packb(data: Any) -> bytes:
+    """Encode JSON-compatible data as MessagePack"""
+    return _import_msgpack().packb(data, use_bin_type=True)
+
+
+def unpackb(body: bytes) -> Any:
+    """
+    Decode a MessagePack body.
+
+    Raises:
+        ValueError: If the body is not valid MessagePack
+    """
+    msgpack = _import_msgpack()
+    try:
+        return msgpack.unpackb(body, raw=False)
+    except (msgpack.UnpackException, ValueError) as e:
+        raise ValueError(f"Invalid MessagePack body: {e}") from e
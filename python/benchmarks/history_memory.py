@@ -0,0 +1,60 @@
+"""
+Memory benchmark: CompactHistory vs. List[Message].
+
+Builds the same synthetic conversation both ways and reports the memory
+retained per turn (container plus message text), measured with
+tracemalloc. With the package installed (``pip install -e .``):
+
+    python benchmarks/history_memory.py [turns ...]
+"""
+import gc
+import sys
+import tracemalloc
+
+from agent_state_bridge.history import CompactHistory
+from agent_state_bridge.models import Message
+
+DEFAULT_TURNS = (10_000, 50_000)
+REPLIES = ("Done!", "Sure, added it to your cart.", "Anything else?", "ok")
+
+
+def synthetic_turns(turns: int):
+    """Alternating user/assistant turns with a mix of unique and repeated text"""
+    for i in range(turns):
+        if i % 2 == 0:
+            yield {"role": "user", "content": f"Please add product-{i} to my cart"}
+        else:
+            # Decoding yields a fresh string per turn, as parsing JSON does
+            reply = REPLIES[i % len(REPLIES)].encode().decode()
+            yield {"role": "assistant", "content": reply}
+
+
+def retained_bytes(build, turns: int) -> int:
+    """Bytes still allocated once `build()` has consumed all turns"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    container = build(synthetic_turns(turns))
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del container
+    return after - before
+
+
+def main(argv) -> None:
+    sizes = [int(arg) for arg in argv] or DEFAULT_TURNS
+    print(f"{'turns':>8} {'List[Message]':>16} {'Compact':>12} {'Compact+intern':>16}")
+    for turns in sizes:
+        results = []
+        for build in (
+            lambda raw: [Message(**t) for t in raw],
+            lambda raw: CompactHistory(raw),
+            lambda raw: CompactHistory(raw, intern=True),
+        ):
+            results.append(retained_bytes(build, turns) / turns)
+        print(f"{turns:>8} {results[0]:>12.0f} B/t {results[1]:>8.0f} B/t {results[2]:>12.0f} B/t")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
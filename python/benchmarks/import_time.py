@@ -0,0 +1,78 @@
+"""
+Import-time benchmark for agent-state-bridge.
+
+Measures how long a fresh interpreter takes to import each public module
+(timed inside the interpreter, so process startup is excluded) and fails
+when a module exceeds its budget. The package is imported from the
+``python/`` directory this script lives in:
+
+    python benchmarks/import_time.py
+
+Budgets (milliseconds, median of several runs):
+
+- ``agent_state_bridge``: 15 ms. The package must not import pydantic or
+  any web framework until a model or integration is actually used.
+- ``agent_state_bridge.fastapi`` / ``.flask`` / ``.django``: 15 ms each.
+  Framework imports are deferred until a router, blueprint or view is
+  created.
+"""
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGETS_MS = {
+    "agent_state_bridge": 15.0,
+    "agent_state_bridge.fastapi": 15.0,
+    "agent_state_bridge.flask": 15.0,
+    "agent_state_bridge.django": 15.0,
+}
+RUNS = 7
+HEAVY_MODULES = ("pydantic", "fastapi", "flask", "rest_framework")
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _time_import(module: str) -> float:
+    """Cold import of `module` in a fresh interpreter, timed inside it"""
+    script = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; "
+        "print((time.perf_counter() - start) * 1000)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True, cwd=PACKAGE_ROOT
+    ).stdout
+    return float(out)
+
+
+def measure(module: str) -> float:
+    """Median import cost of `module` in milliseconds"""
+    return statistics.median(_time_import(module) for _ in range(RUNS))
+
+
+def heavy_imports(module: str) -> list:
+    """Heavy dependencies that importing `module` pulls in"""
+    check = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", check], check=True, capture_output=True, text=True, cwd=PACKAGE_ROOT
+    ).stdout.strip()
+    return [m for m in out.split(",") if m]
+
+
+def main() -> int:
+    failed = False
+    for module, budget in BUDGETS_MS.items():
+        elapsed = measure(module)
+        heavy = heavy_imports(module)
+        ok = elapsed <= budget and not heavy
+        failed |= not ok
+        note = f" (imports {', '.join(heavy)})" if heavy else ""
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<30} {elapsed:7.1f} ms / {budget:.0f} ms{note}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Wire format benchmark: JSON vs. MessagePack for `/chat` payloads.
+
+Builds representative shopping-cart and todo-app requests (catalog or todo
+list in ``context`` plus a short conversation) and reports the body size
+and the time to encode and to decode-and-validate each one into an
+`AgentRequest`, as the server does. With the package and the ``msgpack``
+extra installed (``pip install -e .[msgpack]``):
+
+    python benchmarks/wire_format.py [items ...]
+"""
+import json
+import sys
+import timeit
+
+from agent_state_bridge import wire
+from agent_state_bridge.models import AgentRequest
+
+DEFAULT_ITEMS = (50, 500)
+CATEGORIES = ("Electronics", "Books", "Home", "Garden", "Toys")
+
+
+def conversation(turns: int = 10):
+    messages = []
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"Can you add item {i} to my list, please?"})
+        messages.append({"role": "assistant", "content": f"Done! Item {i} has been added."})
+    return messages
+
+
+def cart_request(items: int) -> dict:
+    products = [
+        {
+            "name": f"Product {i}",
+            "price": round(4.99 + i * 1.25, 2),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "description": f"A reliable product number {i} with a short marketing description.",
+            "stock": i % 37,
+        }
+        for i in range(items)
+    ]
+    cart = [{"name": p["name"], "price": p["price"], "quantity": 1 + i % 3} for i, p in enumerate(products[:10])]
+    return {
+        "messages": conversation(),
+        "actions": [{"type": "post", "payload": {"productName": "Product 1"}}],
+        "context": {"cart": {"items": cart, "total": sum(c["price"] * c["quantity"] for c in cart)}, "products": products},
+    }
+
+
+def todo_request(items: int) -> dict:
+    todos = [{"id": i, "text": f"Task number {i}: follow up on the weekly report", "done": i % 3 == 0} for i in range(items)]
+    done = sum(t["done"] for t in todos)
+    return {
+        "messages": conversation(),
+        "actions": [{"type": "put", "payload": {"id": 3}}],
+        "context": {
+            "todos": todos,
+            "summary": {"total": items, "completed": done, "pending": items - done,
+                        "completionRate": round(done / items * 100)},
+        },
+    }
+
+
+def per_call_us(fn, number: int = 200) -> float:
+    """Best-of-5 time per call in microseconds"""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def measure(data: dict):
+    json_body = json.dumps(data).encode()
+    msgpack_body = wire.packb(data)
+    return {
+        "json": (
+            len(json_body),
+            per_call_us(lambda: json.dumps(data).encode()),
+            per_call_us(lambda: AgentRequest.model_validate(json.loads(json_body))),
+        ),
+        "msgpack": (
+            len(msgpack_body),
+            per_call_us(lambda: wire.packb(data)),
+            per_call_us(lambda: AgentRequest.model_validate(wire.unpackb(msgpack_body))),
+        ),
+    }
+
+
+def main(argv) -> None:
+    sizes = [int(arg) for arg in argv] or DEFAULT_ITEMS
+    print(f"{'payload':<12} {'items':>6} {'format':<8} {'bytes':>9} {'encode':>11} {'decode':>11}")
+    for name, build in (("cart", cart_request), ("todo", todo_request)):
+        for items in sizes:
+            results = measure(build(items))
+            for fmt, (size, encode_us, decode_us) in results.items():
+                print(f"{name:<12} {items:>6} {fmt:<8} {size:>9} {encode_us:>8.1f} us {decode_us:>8.1f} us")
+            ratio = results["msgpack"][0] / results["json"][0]
+            print(f"{'':<12} {'':>6} {'size':<8} {ratio:>8.0%} of JSON")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
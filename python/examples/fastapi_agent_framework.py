@@ -1,8 +1,12 @@
 """
 Example: Using agent-state-bridge with Microsoft Agent Framework and FastAPI
 """
+import asyncio
+from functools import lru_cache
+
 from fastapi import FastAPI
 from agent_state_bridge.fastapi import create_agent_router
+from agent_state_bridge.polling import RunPoller
 
 # Example using Microsoft Agent Framework
 try:
@@ -14,53 +18,75 @@ except ImportError:
     raise
 
 
-# Initialize Azure AI Project Client
+# Initialize Azure AI Project Client on first use, not at import time
 # Note: Requires AZURE_AI_PROJECT_CONNECTION_STRING or endpoint/key
-project_client = AIProjectClient(
-    credential=DefaultAzureCredential(),
-    endpoint="<your-endpoint>"
-)
+@lru_cache(maxsize=1)
+def get_project_client() -> AIProjectClient:
+    """Create the project client once"""
+    return AIProjectClient(
+        credential=DefaultAzureCredential(),
+        endpoint="<your-endpoint>"
+    )
+
+
+# Create agent on first use
+@lru_cache(maxsize=1)
+def get_agent():
+    """Create the agent once"""
+    return get_project_client().agents.create_agent(
+        model="gpt-4o-mini",
+        instructions="You are a helpful shopping assistant."
+    )
+
 
-# Create agent
-agent = project_client.agents.create_agent(
-    model="gpt-4o-mini",
-    instructions="You are a helpful shopping assistant."
-)
+# One background task polls the runs of all concurrent requests, with
+# exponential backoff instead of a busy loop
+run_poller = RunPoller(initial_delay=0.25, max_delay=2.0)
 
 
 async def agent_framework_handler(message: str, state: dict) -> str:
     """Process message using Microsoft Agent Framework"""
+    # The Azure SDK calls block, so run them in worker threads to keep the
+    # event loop free for other requests
+    project_client = await asyncio.to_thread(get_project_client)
+    agent = await asyncio.to_thread(get_agent)
+
     # Create thread
-    thread = project_client.agents.create_thread()
+    thread = await asyncio.to_thread(project_client.agents.create_thread)
     
     # Add context from state
     cart_items = state.get("cart", {}).get("items", [])
     context_msg = f"Current cart has {len(cart_items)} items."
     
     # Send messages
-    project_client.agents.create_message(
+    await asyncio.to_thread(
+        project_client.agents.create_message,
         thread_id=thread.id,
         content=context_msg,
         role="user"
     )
-    project_client.agents.create_message(
+    await asyncio.to_thread(
+        project_client.agents.create_message,
         thread_id=thread.id,
         content=message,
         role="user"
     )
     
     # Run agent
-    run = project_client.agents.create_run(
+    run = await asyncio.to_thread(
+        project_client.agents.create_run,
         thread_id=thread.id,
         assistant_id=agent.id
     )
     
-    # Wait for completion
-    while run.status in ["queued", "in_progress"]:
-        run = project_client.agents.get_run(thread_id=thread.id, run_id=run.id)
+    # Wait for completion without blocking the event loop
+    run = await run_poller.wait(
+        lambda: project_client.agents.get_run(thread_id=thread.id, run_id=run.id),
+        lambda current: current.status not in ["queued", "in_progress"],
+    )
     
     # Get response
-    messages = project_client.agents.list_messages(thread_id=thread.id)
+    messages = await asyncio.to_thread(project_client.agents.list_messages, thread_id=thread.id)
     return messages.data[0].content[0].text.value
 
 
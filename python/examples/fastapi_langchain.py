@@ -1,8 +1,11 @@
 """
 Example: Using agent-state-bridge with LangChain and FastAPI
 """
+from functools import lru_cache
+
 from fastapi import FastAPI
-from agent_state_bridge.fastapi import create_agent_router
+from agent_state_bridge.clients import HTTPClientPool
+from agent_state_bridge.fastapi import AgentBridge
 
 # Example using LangChain
 try:
@@ -13,8 +16,18 @@ except ImportError:
     raise
 
 
-# Initialize LangChain model
-llm = ChatOpenAI(model="gpt-4o-mini")
+# Connections to the model provider are pooled and kept alive by the bridge
+http_pool = HTTPClientPool(max_connections_per_host=20, keepalive_expiry=60)
+
+
+# Initialize LangChain model on first request
+@lru_cache(maxsize=1)
+def get_llm() -> ChatOpenAI:
+    """Create the LangChain model once"""
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        http_async_client=http_pool.client("https://api.openai.com"),
+    )
 
 
 async def langchain_agent(message: str, state: dict) -> str:
@@ -28,16 +41,17 @@ async def langchain_agent(message: str, state: dict) -> str:
         HumanMessage(content=message)
     ]
     
-    response = await llm.ainvoke(messages)
+    response = await get_llm().ainvoke(messages)
     return response.content
 
 
 # Create FastAPI app
 app = FastAPI(title="LangChain Agent Example")
 
-# Add agent router
-router = create_agent_router(langchain_agent, tags=["langchain"])
-app.include_router(router)
+# Add agent router; the bridge opens and closes the HTTP pool with the app
+bridge = AgentBridge(tags=["langchain"], http=http_pool)
+bridge.agent_handler(langchain_agent)
+bridge.init_app(app)
 
 
 if __name__ == "__main__":
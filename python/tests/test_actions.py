@@ -0,0 +1,205 @@
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from agent_state_bridge.actions import ActionCompactor, ActionRegistry, keep_both
+from agent_state_bridge.models import Action, AgentResponse
+
+
+class TaskRef(BaseModel):
+    id: int
+
+
+class NewTask(BaseModel):
+    text: str
+
+
+def todo_registry():
+    registry = ActionRegistry()
+    registry.register("post", NewTask)
+    registry.register("put", TaskRef)
+    registry.register("clear")
+    return registry
+
+
+def act(action_type, **payload):
+    return Action(type=action_type, payload=payload or None)
+
+
+def dump(actions):
+    return [(a.type, a.payload) for a in actions]
+
+
+# -- ActionCompactor -------------------------------------------------------
+
+@pytest.mark.parametrize("log, expected", [
+    ([act("post", id=1, text="a"), act("put", id=1, done=True)], [("post", {"id": 1, "text": "a", "done": True})]),
+    ([act("put", id=1, text="a"), act("put", id=1, text="b")], [("put", {"id": 1, "text": "b"})]),
+    ([act("post", id=1), act("put", id=1, done=True), act("delete", id=1)], []),
+    ([act("put", id=1, done=True), act("delete", id=1)], [("delete", {"id": 1})]),
+    ([act("delete", id=1), act("post", id=1)], [("delete", {"id": 1}), ("post", {"id": 1})]),
+])
+def test_default_rules(log, expected):
+    assert dump(ActionCompactor().compact(log)) == expected
+
+
+def test_custom_rule_as_decorator():
+    compactor = ActionCompactor()
+
+    @compactor.rule("put", "put")
+    def toggle(prev, nxt):
+        return []
+
+    assert compactor.compact([act("put", id=1), act("put", id=1)]) == []
+    assert compactor.rule("put", "put", keep_both) is keep_both
+    assert len(compactor.compact([act("put", id=1), act("put", id=1)])) == 2
+
+
+def test_keyless_actions_pass_through_and_order_is_kept():
+    log = [
+        act("post", id=1, text="a"),
+        act("clear"),
+        act("post", id=2, text="b"),
+        act("put", id=1, done=True),
+        act("refresh", scope="all"),
+        act("delete", id=2),
+    ]
+    assert dump(ActionCompactor().compact(log)) == [
+        ("post", {"id": 1, "text": "a", "done": True}),
+        ("clear", None),
+        ("refresh", {"scope": "all"}),
+    ]
+
+
+def test_custom_key_fields():
+    compactor = ActionCompactor(key_fields=("productName", "id"))
+    log = [act("post", productName="Shoe"), act("delete", productName="Shoe"), act("post", id=7)]
+    assert dump(compactor.compact(log)) == [("post", {"id": 7})]
+
+
+# -- ActionRegistry --------------------------------------------------------
+
+def test_registry_validates_typed_payloads():
+    registry = todo_registry()
+    actions = registry.validate([
+        {"type": "post", "payload": {"text": "milk"}},
+        Action(type="put", payload={"id": "3"}),
+        {"type": "clear"},
+    ])
+    assert [type(a).__name__ for a in actions] == ["PostAction", "PutAction", "ClearAction"]
+    assert isinstance(actions[0].payload, NewTask) and actions[0].payload.text == "milk"
+    assert actions[1].payload == TaskRef(id=3)
+    assert actions[2].payload is None
+    assert registry.action_model("put") is type(actions[1])
+
+
+@pytest.mark.parametrize("action", [
+    {"type": "archive", "payload": {"id": 1}},
+    {"type": "put", "payload": {"text": "no id"}},
+    {"type": "post"},
+])
+def test_registry_rejects_bad_actions(action):
+    with pytest.raises(ValidationError):
+        todo_registry().validate([action])
+
+
+def test_registry_compiles_once():
+    registry = todo_registry()
+    assert registry.compile() is registry.compile()
+    assert registry.request_model() is registry.request_model()
+
+
+def test_register_after_compile_is_an_error():
+    registry = todo_registry()
+    registry.compile()
+    with pytest.raises(RuntimeError):
+        registry.register("delete", TaskRef)
+
+
+def test_empty_registry_cannot_compile():
+    with pytest.raises(ValueError):
+        ActionRegistry().compile()
+
+
+# -- ActionRegistry in the FastAPI router ----------------------------------
+
+fastapi = pytest.importorskip("fastapi")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agent_state_bridge.fastapi import create_agent_router
+
+
+def make_app(handler, registry):
+    app = FastAPI()
+    router = create_agent_router(handler, registry=registry)
+    app.include_router(router)
+    return TestClient(app, raise_server_exceptions=False), router.metrics
+
+
+def test_router_passes_typed_actions_and_rejects_bad_ones():
+    seen = []
+
+    async def agent(messages, actions, context):
+        seen.extend(actions)
+        return AgentResponse(response="ok", actions=[{"type": "put", "payload": {"id": 1}}])
+
+    client, _ = make_app(agent, todo_registry())
+    res = client.post("/chat", json={"messages": [], "actions": [{"type": "post", "payload": {"text": "milk"}}]})
+    assert res.status_code == 200
+    assert res.json()["actions"] == [{"type": "put", "payload": {"id": 1}}]
+    assert isinstance(seen[0].payload, NewTask)
+
+    res = client.post("/chat", json={"messages": [], "actions": [{"type": "archive", "payload": {}}]})
+    assert res.status_code == 422
+
+
+def test_invalid_handler_actions_are_counted_as_errors():
+    async def agent(messages, actions, context):
+        return AgentResponse(response="oops", actions=[{"type": "archive"}])
+
+    client, metrics = make_app(agent, todo_registry())
+    assert client.post("/chat", json={"messages": []}).status_code == 500
+    assert metrics.counter("errors") == 1
+    assert metrics.counter("completed") == 0
+
+
+def test_openapi_with_two_registries():
+    async def agent(messages, actions, context):
+        return AgentResponse(response="ok")
+
+    other = ActionRegistry()
+    other.register("add", NewTask)
+    app = FastAPI()
+    app.include_router(create_agent_router(agent, prefix="/todo", registry=todo_registry()))
+    app.include_router(create_agent_router(agent, prefix="/cart", registry=other))
+    schema = app.openapi()
+    components = schema["components"]["schemas"]
+    for path in ("/todo/chat", "/cart/chat"):
+        content = schema["paths"][path]["post"]["requestBody"]["content"]
+        ref = content["application/json"]["schema"]["$ref"]
+        assert ref.rsplit("/", 1)[1] in components
+        assert "application/msgpack" in content
+
+
+def test_router_counts_compacted_actions_on_request_and_response():
+    seen = []
+
+    async def agent(messages, actions, context):
+        seen.extend(actions)
+        return AgentResponse(response="ok", actions=[
+            {"type": "post", "payload": {"id": 9}},
+            {"type": "delete", "payload": {"id": 9}},
+            {"type": "put", "payload": {"id": 2}},
+        ])
+
+    app = FastAPI()
+    router = create_agent_router(agent, compactor=ActionCompactor())
+    app.include_router(router)
+    res = TestClient(app).post("/chat", json={"messages": [], "actions": [
+        {"type": "post", "payload": {"id": 1, "text": "a"}},
+        {"type": "put", "payload": {"id": 1, "done": True}},
+    ]})
+    assert dump(seen) == [("post", {"id": 1, "text": "a", "done": True})]
+    assert res.json()["actions"] == [{"type": "put", "payload": {"id": 2}}]
+    assert router.metrics.counter("actions_compacted") == 3
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from agent_state_bridge.clients import HTTPClientPool
+from agent_state_bridge.metrics import Metrics
+
+
+def test_client_keeps_the_base_url_path():
+    seen = []
+
+    async def handler(request):
+        seen.append(str(request.url))
+        return httpx.Response(200, json={})
+
+    async def main():
+        pool = HTTPClientPool(transport=httpx.MockTransport(handler))
+        await pool.client("https://api.example.com/v1").get("/chat")
+        await pool.client("https://api.example.com/v1/").get("models")
+        await pool.client().get("https://other.example.com/ping")
+        stats = pool.stats()
+        await pool.close()
+        return stats
+
+    stats = asyncio.run(main())
+    assert seen == [
+        "https://api.example.com/v1/chat",
+        "https://api.example.com/v1/models",
+        "https://other.example.com/ping",
+    ]
+    assert stats["requests"] == {"https://api.example.com": 2, "default": 1}
+
+
+def test_clients_for_one_host_share_its_connection_pool():
+    async def main():
+        metrics = Metrics()
+        pool = HTTPClientPool(max_connections_per_host=2, metrics=metrics)
+        v1 = pool.client("https://api.example.com/v1")
+        v2 = pool.client("https://api.example.com/v2")
+        other = pool.client("https://other.example.com")
+        assert v1 is pool.client("https://api.example.com/v1/")
+        assert v1 is not v2
+        assert v1._transport is v2._transport
+        assert other._transport is not v1._transport
+        assert pool.stats()["hosts"] == 2
+        assert metrics.gauge("http.clients") == 3
+        await pool.close()
+        return v1, metrics
+
+    v1, metrics = asyncio.run(main())
+    assert v1.is_closed
+    assert metrics.gauge("http.clients") == 0
+
+
+def test_closed_pool_refuses_clients():
+    async def main():
+        pool = HTTPClientPool()
+        await pool.start()
+        await pool.close()
+        with pytest.raises(RuntimeError):
+            pool.client()
+
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from agent_state_bridge.dispatch import FanOut, Hedge, Race, combine_handlers
+from agent_state_bridge.metrics import Metrics
+from agent_state_bridge.models import Action, AgentResponse
+
+
+def backend(reply, delay=0.0, error=None, actions=None, log=None):
+    async def handler(messages, actions_, context):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if log is not None:
+                log.append(f"{reply} cancelled")
+            raise
+        if error is not None:
+            raise error
+        return AgentResponse(response=reply, actions=actions)
+    return handler
+
+
+def run(handlers, policy):
+    metrics = Metrics()
+    combined = combine_handlers(handlers, policy, metrics)
+
+    async def main():
+        response = await combined([], [], {})
+        await asyncio.sleep(0.01)  # Let cancelled losers unwind
+        return response
+
+    return asyncio.run(main()), metrics
+
+
+def test_list_backends_get_unique_names():
+    metrics = Metrics()
+    combined = combine_handlers(
+        [lambda *a: backend("a")(*a), lambda *a: backend("b", delay=0.2)(*a)], Race(), metrics
+    )
+    response = asyncio.run(combined([], [], {}))
+    assert response.response == "a"
+    assert metrics.counter("backend.<lambda>.wins") == 1
+    assert metrics.counter("backend.<lambda>_1.cancelled") == 1
+
+
+def test_no_backends():
+    with pytest.raises(ValueError):
+        combine_handlers({})
+
+
+# -- Hedge -----------------------------------------------------------------
+
+def test_hedge_primary_answers_before_delay():
+    response, metrics = run({"primary": backend("p"), "backup": backend("b")}, Hedge(delay=0.5))
+    assert response.response == "p"
+    assert metrics.counter("hedge.fired") == 0
+    assert metrics.counter("backend.backup.completed") == 0
+
+
+def test_hedge_fires_after_delay_and_cancels_the_loser():
+    log = []
+    response, metrics = run(
+        {"primary": backend("p", delay=1, log=log), "backup": backend("b")}, Hedge(delay=0.02)
+    )
+    assert response.response == "b"
+    assert metrics.counter("hedge.fired") == 1
+    assert metrics.counter("backend.backup.wins") == 1
+    assert metrics.counter("backend.primary.cancelled") == 1
+    assert log == ["p cancelled"]
+
+
+def test_hedge_falls_back_immediately_on_error():
+    response, metrics = run(
+        {"primary": backend("p", error=RuntimeError("down")), "backup": backend("b")}, Hedge(delay=10)
+    )
+    assert response.response == "b"
+    assert metrics.counter("backend.primary.errors") == 1
+
+
+def test_hedge_raises_the_last_error_when_all_fail():
+    with pytest.raises(KeyError):
+        run({"a": backend("a", error=RuntimeError()), "b": backend("b", error=KeyError())}, Hedge(delay=0))
+
+
+# -- Race ------------------------------------------------------------------
+
+def test_race_first_success_wins_and_losers_are_cancelled():
+    log = []
+    response, metrics = run(
+        {"slow": backend("s", delay=1, log=log), "fast": backend("f", delay=0.01)}, Race()
+    )
+    assert response.response == "f"
+    assert metrics.counter("backend.fast.wins") == 1
+    assert metrics.counter("backend.slow.cancelled") == 1
+    assert log == ["s cancelled"]
+
+
+def test_race_ignores_failures_while_others_run():
+    response, metrics = run(
+        {"broken": backend("x", error=RuntimeError()), "ok": backend("ok", delay=0.01)}, Race()
+    )
+    assert response.response == "ok"
+    assert metrics.counter("backend.broken.errors") == 1
+
+
+# -- FanOut ----------------------------------------------------------------
+
+def test_fan_out_merges_in_declaration_order():
+    put = Action(type="put", payload={"id": 1})
+    response, _ = run({
+        "first": backend("one", delay=0.02, actions=[put]),
+        "second": backend("two", actions=[put, Action(type="delete", payload={"id": 2})]),
+    }, FanOut())
+    assert response.response == "one"
+    assert [a.type for a in response.actions] == ["put", "delete"]
+
+
+def test_fan_out_skips_failed_backends():
+    response, metrics = run(
+        {"broken": backend("x", error=RuntimeError()), "ok": backend("ok")}, FanOut()
+    )
+    assert response.response == "ok"
+    assert metrics.counter("backend.broken.errors") == 1
+
+
+def test_fan_out_timeout_cancels_slow_backends():
+    log = []
+    response, metrics = run(
+        {"slow": backend("s", delay=1, log=log), "fast": backend("f")}, FanOut(timeout=0.05)
+    )
+    assert response.response == "f"
+    assert metrics.counter("backend.slow.cancelled") == 1
+    assert log == ["s cancelled"]
+
+
+def test_fan_out_timeout_with_no_answer():
+    with pytest.raises(asyncio.TimeoutError):
+        run({"slow": backend("s", delay=1)}, FanOut(timeout=0.01))
@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("rest_framework")
+
+import django
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure(
+        ROOT_URLCONF=__name__,
+        ALLOWED_HOSTS=["*"],
+        INSTALLED_APPS=["django.contrib.contenttypes", "django.contrib.auth", "rest_framework"],
+        SECRET_KEY="test",
+    )
+    django.setup()
+
+from django.urls import path
+from rest_framework.test import APIClient
+
+from agent_state_bridge import wire
+from agent_state_bridge.django import AgentAPIView, agent_api_view
+
+
+@agent_api_view
+def echo_view(message, state):
+    return f"{message}:{len(state)}"
+
+
+class EchoView(AgentAPIView):
+    def process_agent(self, message, state):
+        return message.upper()
+
+
+urlpatterns = [path("fn/", echo_view), path("cls/", EchoView.as_view())]
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+@pytest.mark.parametrize("url, expected", [("/fn/", "hi:1"), ("/cls/", "HI")])
+def test_json_by_default(client, url, expected):
+    res = client.post(url, {"message": "hi", "state": {"a": 1}}, format="json")
+    assert res.status_code == 200
+    assert res.json() == {"response": expected}
+
+
+@pytest.mark.parametrize("url, expected", [("/fn/", "hi:0"), ("/cls/", "HI")])
+def test_msgpack_request_and_response(client, url, expected):
+    msgpack = pytest.importorskip("msgpack")
+    res = client.post(
+        url, msgpack.packb({"message": "hi", "state": {}}), content_type=wire.MSGPACK, HTTP_ACCEPT=wire.MSGPACK
+    )
+    assert res.status_code == 200
+    assert res["Content-Type"] == wire.MSGPACK
+    assert msgpack.unpackb(res.content) == {"response": expected}
+
+
+def test_unacceptable_accept_falls_back_to_json(client):
+    res = client.post("/fn/", {"message": "hi"}, format="json", HTTP_ACCEPT="text/csv")
+    assert res.status_code == 200
+    assert res.json() == {"response": "hi:0"}
@@ -0,0 +1,189 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agent_state_bridge import wire
+from agent_state_bridge.fastapi import _resolve_timeout, create_agent_router
+from agent_state_bridge.models import AgentResponse
+
+
+@pytest.mark.parametrize(
+    "header, default, expected",
+    [
+        (None, 30, 30),
+        ("5", 30, 5),
+        ("60", 30, 30),
+        ("5", None, 5),
+        ("0", 30, 30),
+        ("-1", None, None),
+        ("soon", 30, 30),
+        ("nan", 30, 30),
+        ("inf", None, None),
+    ],
+)
+def test_resolve_timeout(header, default, expected):
+    assert _resolve_timeout(header, default) == expected
+
+
+def make_client(handler, **kwargs):
+    app = FastAPI()
+    router = create_agent_router(handler, **kwargs)
+    app.include_router(router)
+    return TestClient(app), router.metrics
+
+
+def test_nan_header_does_not_time_out_immediately():
+    async def agent(messages, actions, context):
+        await asyncio.sleep(0.01)
+        return AgentResponse(response="ok")
+
+    client, metrics = make_client(agent, timeout=5)
+    res = client.post("/chat", json={"messages": []}, headers={"X-Agent-Timeout": "nan"})
+    assert res.status_code == 200
+    assert metrics.counter("timed_out") == 0
+
+
+def test_handler_past_deadline_gets_504():
+    async def agent(messages, actions, context):
+        await asyncio.sleep(1)
+        return AgentResponse(response="late")
+
+    client, metrics = make_client(agent)
+    res = client.post("/chat", json={"messages": []}, headers={"X-Agent-Timeout": "0.05"})
+    assert res.status_code == 504
+    assert metrics.counter("timed_out") == 1
+
+
+def call_with_disconnect(app, body):
+    """Drive the ASGI app directly: send `body`, then report a client disconnect"""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/chat", "raw_path": b"/chat", "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    return next(m["status"] for m in sent if m["type"] == "http.response.start")
+
+
+def test_client_disconnect_cancels_the_handler_with_499():
+    events = []
+
+    async def agent(messages, actions, context):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        return AgentResponse(response="late")
+
+    app = FastAPI()
+    router = create_agent_router(agent, disconnect_poll_interval=0.01)
+    app.include_router(router)
+    assert call_with_disconnect(app, b'{"messages": []}') == 499
+    assert events == ["cancelled"]
+    assert router.metrics.counter("cancelled") == 1
+    assert router.metrics.counter("errors") == 0
+
+
+async def echo(messages, actions, context):
+    return AgentResponse(response=messages[-1].content, context={"seen": context})
+
+
+def test_msgpack_request_and_response():
+    msgpack = pytest.importorskip("msgpack")
+    client, metrics = make_client(echo)
+    body = msgpack.packb({"messages": [{"role": "user", "content": "hi"}], "context": {"n": 1}})
+    res = client.post("/chat", content=body, headers={"Content-Type": wire.MSGPACK, "Accept": wire.MSGPACK})
+    assert res.status_code == 200
+    assert res.headers["content-type"] == wire.MSGPACK
+    assert msgpack.unpackb(res.content) == {"response": "hi", "actions": None, "context": {"seen": {"n": 1}}}
+
+    res = client.post("/chat", content=body, headers={"Content-Type": wire.MSGPACK})
+    assert res.json()["response"] == "hi"  # JSON unless the client asks for MessagePack
+    assert metrics.counter("completed") == 2
+
+
+def test_invalid_msgpack_body_gets_400():
+    pytest.importorskip("msgpack")
+    client, metrics = make_client(echo)
+    res = client.post("/chat", content=b"\xc1", headers={"Content-Type": wire.MSGPACK})
+    assert res.status_code == 400
+    assert metrics.counter("requests") == 0
+
+
+def test_without_msgpack_installed(monkeypatch):
+    monkeypatch.setattr(wire, "msgpack_available", lambda: False)
+    client, _ = make_client(echo)
+    res = client.post("/chat", content=b"\x81", headers={"Content-Type": wire.MSGPACK})
+    assert res.status_code == 415
+    res = client.post(
+        "/chat", json={"messages": [{"role": "user", "content": "hi"}]}, headers={"Accept": wire.MSGPACK}
+    )
+    assert res.status_code == 200
+    assert res.json()["response"] == "hi"
+
+
+def test_bridge_lifespan_opens_and_closes_owned_resources():
+    from agent_state_bridge.clients import HTTPClientPool
+    from agent_state_bridge.fastapi import AgentBridge
+    from agent_state_bridge.runtime import defer
+    from agent_state_bridge.store import RedisStore
+    from agent_state_bridge.tasks import BackgroundQueue
+    from agent_state_bridge.testing import InMemoryRedis
+
+    events = []
+    redis = InMemoryRedis()
+    http = HTTPClientPool()
+    bridge = AgentBridge(
+        store=RedisStore(redis, prefix="t:", flush_interval=60),
+        http=http,
+        tasks=BackgroundQueue(),
+    )
+
+    @bridge.agent_handler
+    async def agent(messages, actions, context):
+        defer(events.append, "deferred")
+        return AgentResponse(response="ok")
+
+    bridge.on_startup(lambda: events.append("startup 1"))
+
+    @bridge.on_startup
+    async def second():
+        events.append("startup 2")
+
+    bridge.on_shutdown(lambda: events.append("shutdown 1"))
+
+    @bridge.on_shutdown
+    async def last():
+        events.append("shutdown 2")
+        bridge.store.set("saved", True)
+
+    app = FastAPI()
+    bridge.init_app(app)
+    with TestClient(app) as client:
+        assert events == ["startup 1", "startup 2"]
+        assert bridge.tasks.metrics is bridge.metrics and http.metrics is bridge.metrics
+        assert client.post("/chat", json={"messages": []}).json()["response"] == "ok"
+
+    assert [e for e in events if e.startswith("shutdown")] == ["shutdown 2", "shutdown 1"]
+    assert "deferred" in events  # The queue was drained
+    assert redis.get("t:saved") == b"true"  # Pending writes flushed on close
+    with pytest.raises(RuntimeError):
+        http.client()
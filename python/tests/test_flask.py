@@ -0,0 +1,40 @@
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from agent_state_bridge import flask as flask_integration
+from agent_state_bridge import wire
+
+
+@pytest.fixture
+def client():
+    app = flask.Flask(__name__)
+    app.register_blueprint(flask_integration.create_agent_blueprint(lambda message, state: f"{message}:{len(state)}"))
+    return app.test_client()
+
+
+def test_json_by_default(client):
+    res = client.post("/chat", json={"message": "hi", "state": {"a": 1}})
+    assert res.status_code == 200
+    assert res.json == {"response": "hi:1"}
+
+
+def test_msgpack_request_and_response(client):
+    msgpack = pytest.importorskip("msgpack")
+    res = client.post(
+        "/chat",
+        data=msgpack.packb({"message": "hi", "state": {}}),
+        headers={"Content-Type": wire.MSGPACK, "Accept": wire.MSGPACK},
+    )
+    assert res.status_code == 200
+    assert res.mimetype == wire.MSGPACK
+    assert msgpack.unpackb(res.data) == {"response": "hi:0"}
+
+
+def test_without_msgpack_installed(client, monkeypatch):
+    monkeypatch.setattr(wire, "msgpack_available", lambda: False)
+    res = client.post("/chat", data=b"\x81", headers={"Content-Type": wire.MSGPACK})
+    assert res.status_code == 415
+    res = client.post("/chat", json={"message": "hi"}, headers={"Accept": wire.MSGPACK})
+    assert res.status_code == 200
+    assert res.json == {"response": "hi:0"}
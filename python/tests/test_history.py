@@ -0,0 +1,35 @@
+from agent_state_bridge.history import CompactHistory, Role
+from agent_state_bridge.models import Message
+
+
+def make_history():
+    return CompactHistory(
+        [{"role": "user", "content": "hi"}, Message(role="assistant", content="hello")]
+    )
+
+
+def test_roles_contents_and_indexing():
+    history = make_history()
+    history.append(Role.TOOL, "result")
+    history.append("critic", "fine")
+    assert len(history) == 4
+    assert [history.role_at(i) for i in range(4)] == ["user", "assistant", "tool", "critic"]
+    assert history[-1] == Message(role="critic", content="fine")
+    assert history[1:3] == [Message(role="assistant", content="hello"), Message(role="tool", content="result")]
+    assert list(history.pairs())[0] == ("user", "hi")
+
+
+def test_to_messages_returns_a_fresh_list():
+    history = make_history()
+    messages = history.to_messages()
+    messages.append(Message(role="user", content="injected"))
+    assert len(history) == 2
+    assert history[-1].content == "hello"
+    assert history.to_messages() is not history.to_messages()
+
+
+def test_intern_shares_repeated_contents():
+    history = CompactHistory(intern=True)
+    for _ in range(2):
+        history.append("assistant", "".join(["o", "k"]))
+    assert history.content_at(0) is history.content_at(1)
@@ -0,0 +1,21 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "import_time", Path(__file__).resolve().parent.parent / "benchmarks" / "import_time.py"
+)
+import_time = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(import_time)
+
+
+@pytest.mark.parametrize("module", list(import_time.BUDGETS_MS))
+def test_import_does_not_pull_in_heavy_dependencies(module):
+    assert import_time.heavy_imports(module) == []
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("module, budget", list(import_time.BUDGETS_MS.items()))
+def test_import_time_within_budget(module, budget):
+    assert import_time.measure(module) <= budget
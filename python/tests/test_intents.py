@@ -0,0 +1,114 @@
+import re
+
+import pytest
+
+from agent_state_bridge.intents import IntentRouter
+from agent_state_bridge.metrics import Metrics
+from agent_state_bridge.models import Action, AgentResponse, Message
+
+
+def user(text):
+    return [Message(role="user", content=text)]
+
+
+def todo_intents(metrics=None):
+    intents = IntentRouter(metrics=metrics)
+
+    @intents.intent(r"delete task (?P<id>\d+)")
+    def delete_task(slots, messages, actions, context):
+        task_id = int(slots["id"])
+        if task_id not in context.get("ids", []):
+            return None
+        return AgentResponse(response=f"Deleted #{task_id}", actions=[Action(type="delete", payload={"id": task_id})])
+
+    return intents
+
+
+def test_only_full_matches_take_the_fast_path():
+    intents = todo_intents()
+    context = {"ids": [3]}
+    assert intents.match(user("  Delete   task 3 "), [], context).response == "Deleted #3"
+    assert intents.match(user("delete task 3 and add milk"), [], context) is None
+    assert intents.match(user("please delete task 3"), [], context) is None
+
+
+def test_callback_returning_none_falls_through_to_later_intents():
+    intents = todo_intents()
+    intents.add(r"delete task (\d+)", lambda slots, *_: AgentResponse(response=f"fallback {slots[1]}"))
+    assert intents.match(user("delete task 9"), [], {"ids": [3]}).response == "fallback 9"
+    assert intents.match(user("delete task 3"), [], {"ids": [3]}).response == "Deleted #3"
+
+
+def test_last_message_must_be_from_the_user():
+    intents = todo_intents()
+    messages = user("delete task 3") + [Message(role="assistant", content="Sure?")]
+    assert intents.match(messages, [], {"ids": [3]}) is None
+    assert intents.match([], [], {}) is None
+
+
+def test_callable_grammar_and_compiled_pattern():
+    intents = IntentRouter()
+    intents.add(lambda text: {"n": len(text)} if text.startswith("count") else None,
+                lambda slots, *_: AgentResponse(response=str(slots["n"])))
+    intents.add(re.compile(r"ping"), lambda slots, *_: AgentResponse(response="pong"))
+    assert intents.match(user("count me"), [], {}).response == "8"
+    assert intents.match(user("ping"), [], {}).response == "pong"
+    assert intents.match(user("PING"), [], {}) is None  # Compiled patterns keep their own flags
+
+
+def test_hits_misses_and_hit_rate():
+    metrics = Metrics()
+    intents = todo_intents(metrics)
+    assert intents.hit_rate == 0.0
+    intents.match(user("delete task 3"), [], {"ids": [3]})
+    intents.match(user("delete task 4"), [], {"ids": [3]})
+    intents.match(user("hello"), [], {})
+    intents.match(user("delete task 3"), [], {"ids": [3]})
+    assert metrics.counter("fast_path.hits") == 2
+    assert metrics.counter("fast_path.misses") == 2
+    assert intents.hit_rate == 0.5
+    assert IntentRouter().hit_rate == 0.0
+
+
+# -- IntentRouter in the FastAPI router ------------------------------------
+
+fastapi = pytest.importorskip("fastapi")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agent_state_bridge.fastapi import create_agent_router
+
+
+def make_app(intents):
+    calls = []
+
+    async def agent(messages, actions, context):
+        calls.append(messages[-1].content)
+        return AgentResponse(response="llm")
+
+    app = FastAPI()
+    router = create_agent_router(agent, intents=intents)
+    app.include_router(router)
+    return TestClient(app, raise_server_exceptions=False), router.metrics, calls
+
+
+def test_router_answers_matches_without_the_handler():
+    client, metrics, calls = make_app(todo_intents())
+    body = {"messages": [{"role": "user", "content": "delete task 3"}], "context": {"ids": [3]}}
+    assert client.post("/chat", json=body).json()["actions"] == [{"type": "delete", "payload": {"id": 3}}]
+    body["messages"][0]["content"] = "what's left?"
+    assert client.post("/chat", json=body).json()["response"] == "llm"
+    assert calls == ["what's left?"]
+    assert metrics.counter("fast_path.hits") == 1
+    assert metrics.counter("completed") == 2
+
+
+def test_raising_intent_callback_is_counted_as_an_error():
+    intents = IntentRouter()
+    intents.add(r"boom", lambda *_: 1 / 0)
+    client, metrics, calls = make_app(intents)
+    res = client.post("/chat", json={"messages": [{"role": "user", "content": "boom"}]})
+    assert res.status_code == 500
+    assert metrics.counter("errors") == 1
+    assert calls == []
@@ -0,0 +1,57 @@
+import asyncio
+
+from agent_state_bridge.metrics import Metrics
+from agent_state_bridge.polling import RunPoller, poll_until
+
+
+def test_poll_until_returns_first_done_result():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    result = asyncio.run(poll_until(fetch, lambda n: n >= 3, initial_delay=0.001, jitter=0))
+    assert result == 3
+
+
+def test_run_poller_multiplexes_runs():
+    async def main():
+        poller = RunPoller(initial_delay=0.001, max_delay=0.005)
+        counters = {"a": 0, "b": 0}
+
+        def fetch(name):
+            counters[name] += 1
+            return counters[name]
+
+        results = await asyncio.gather(
+            poller.wait(lambda: fetch("a"), lambda n: n >= 2),
+            poller.wait(lambda: fetch("b"), lambda n: n >= 4),
+        )
+        await poller.close()
+        return results
+
+    assert asyncio.run(main()) == [2, 4]
+
+
+def test_run_poller_stops_when_only_cancelled_runs_remain():
+    async def main():
+        metrics = Metrics()
+        poller = RunPoller(initial_delay=0.01, metrics=metrics)
+        waiter = asyncio.ensure_future(poller.wait(lambda: "pending", lambda status: False))
+        await asyncio.sleep(0.001)
+        waiter.cancel()
+        await asyncio.wait_for(asyncio.shield(poller._task), 1)
+        return len(poller), metrics.gauge("poller.active")
+
+    assert asyncio.run(main()) == (0, 0)
+
+
+def test_run_poller_can_be_reused_from_a_new_event_loop():
+    poller = RunPoller(initial_delay=0.001)
+
+    async def run_once():
+        return await asyncio.wait_for(poller.wait(lambda: "done", lambda status: status == "done"), 1)
+
+    assert asyncio.run(run_once()) == "done"
+    assert asyncio.run(run_once()) == "done"
@@ -0,0 +1,77 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import numpy as np
+
+from agent_state_bridge.models import Message
+from agent_state_bridge.retrieval import ContextRetriever, VectorIndex
+
+
+def ask(text):
+    return [Message(role="user", content=text)]
+
+
+def test_retrieve_ranks_relevant_items_first():
+    retriever = ContextRetriever("products", fields=["name", "category"], top_k=2)
+    context = {"products": [
+        {"id": 1, "name": "red running shoe", "category": "shoes"},
+        {"id": 2, "name": "garden hose", "category": "garden"},
+        {"id": 3, "name": "blue running shoe", "category": "shoes"},
+    ]}
+    names = [p["name"] for p in retriever.retrieve(ask("running shoe"), context)]
+    assert len(names) == 2 and all("shoe" in name for name in names)
+
+
+def test_duplicate_keys_in_one_batch_keep_the_last_item():
+    retriever = ContextRetriever("products", fields=["name"], key="name")
+    context = {"products": [{"name": "red shoe", "v": 1}, {"name": "red shoe", "v": 2}, {"name": "blue hat"}]}
+    assert retriever.retrieve(ask("red shoe"), context)[0] == {"name": "red shoe", "v": 2}
+    assert len(retriever.index) == 2
+    # The index is still usable afterwards
+    assert retriever.retrieve(ask("blue hat"), context)[0] == {"name": "blue hat"}
+
+
+def test_upsert_with_repeated_key_in_batch():
+    index = VectorIndex(2)
+    index.upsert(["a", "a", "b"], np.array([[1, 0], [0, 1], [1, 1]], dtype=np.float32), ["h1", "h2", "h3"])
+    assert index.keys() == ["a", "b"]
+    assert index.content_hash("a") == "h2"
+    assert index.search(np.array([0, 1], dtype=np.float32), 1)[0][0] == "a"
+
+
+def test_sync_only_embeds_changes_and_persists(tmp_path):
+    path = str(tmp_path / "idx")
+    items = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+    retriever = ContextRetriever("items", fields=["name"], path=path)
+    assert retriever.sync(items) == 2
+    assert retriever.sync(items) == 0
+    assert retriever.sync([{"id": 1, "name": "changed"}]) == 1
+    assert len(retriever.index) == 1
+
+    reloaded = ContextRetriever("items", fields=["name"], path=path)
+    assert reloaded.index.keys() == ["1"]
+    assert reloaded.sync([{"id": 1, "name": "changed"}]) == 0
+
+
+def test_concurrent_saves_never_mix_keys_and_vectors(tmp_path):
+    path = str(tmp_path / "idx")
+    first, second = VectorIndex(2, path), VectorIndex(2, path)
+    first.upsert(["a"], np.array([[1, 0]], dtype=np.float32), ["h1"])
+    second.upsert(["x", "y"], np.array([[0, 1], [1, 1]], dtype=np.float32), ["h2", "h3"])
+    first.save()
+    second.save()
+
+    loaded = VectorIndex(2, path)
+    assert loaded.keys() == ["x", "y"]
+    assert loaded.search(np.array([0, 1], dtype=np.float32), 1)[0][0] == "x"
+
+
+def test_save_removes_the_previous_vectors_file(tmp_path):
+    path = str(tmp_path / "idx")
+    index = VectorIndex(2, path)
+    for key in ("a", "b"):
+        index.upsert([key], np.array([[1, 0]], dtype=np.float32), [key])
+        index.save()
+    assert len(list(tmp_path.glob("idx.*.npy"))) == 1
+    assert VectorIndex(2, path).keys() == ["a", "b"]
@@ -0,0 +1,281 @@
+import multiprocessing
+import threading
+import time
+import uuid
+
+import pytest
+
+from agent_state_bridge.metrics import Metrics
+from agent_state_bridge.store import RedisStore, SharedMemoryStore, SQLiteStore
+from agent_state_bridge.testing import InMemoryRedis
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+# -- InMemoryRedis ---------------------------------------------------------
+
+def test_in_memory_redis_expires_keys():
+    clock = FakeClock()
+    client = InMemoryRedis(clock=clock)
+    client.set("a", b"1", px=500)
+    client.set("b", "2", ex=10)
+    client.set("c", b"3")
+    assert client.get("a") == b"1"
+    assert client.ttl("b") == 10 and client.ttl("c") == -1
+
+    clock.advance(1)
+    assert client.get("a") is None
+    assert client.get("b") == b"2"
+    assert sorted(client.scan_iter("*")) == ["b", "c"]
+
+
+def test_in_memory_redis_evicts_least_recently_used():
+    client = InMemoryRedis(max_keys=2)
+    client.set("a", b"1")
+    client.set("b", b"2")
+    client.get("a")
+    client.set("c", b"3")
+    assert client.get("b") is None
+    assert client.get("a") == b"1" and client.get("c") == b"3"
+    assert client.evicted == 1
+
+
+def test_in_memory_redis_pipeline_applies_on_execute():
+    client = InMemoryRedis()
+    pipe = client.pipeline().set("a", b"1").delete("missing")
+    assert client.get("a") is None
+    assert pipe.execute() == [True, 0]
+    assert client.get("a") == b"1"
+
+
+# -- RedisStore against the stand-in ---------------------------------------
+
+def test_redis_store_ttl():
+    clock = FakeClock()
+    store = RedisStore(InMemoryRedis(clock=clock), default_ttl=60, write_behind=False)
+    store.set("session", {"turns": 3})
+    store.set("short", "x", ttl=5)
+    assert store.get("session") == {"turns": 3}
+
+    clock.advance(10)
+    assert store.get("short") is None
+    assert store.get("session") == {"turns": 3}
+    clock.advance(60)
+    assert store.get("session", "gone") == "gone"
+    store.close()
+
+
+def test_redis_store_eviction_follows_server_policy():
+    client = InMemoryRedis(max_keys=3)
+    store = RedisStore(client, prefix="t:", write_behind=False)
+    for i in range(5):
+        store.set(f"k{i}", i)
+    assert [store.get(f"k{i}") for i in range(5)] == [None, None, 2, 3, 4]
+    assert client.evicted == 2
+    store.close()
+
+
+def test_redis_store_write_behind_buffers_until_flush():
+    client = InMemoryRedis()
+    store = RedisStore(client, prefix="t:", flush_interval=60)
+    store.set("a", [1, 2])
+    store.delete("b")
+    assert client.get("t:a") is None
+    assert store.get("a") == [1, 2]  # Served from the pending writes
+    assert store.stats()["pending"] == 2
+
+    store.flush()
+    assert client.get("t:a") == b"[1,2]"
+    assert store.stats()["pending"] == 0
+    store.close()
+
+
+def test_redis_store_flushes_early_when_max_pending_is_reached():
+    client = InMemoryRedis()
+    store = RedisStore(client, prefix="t:", flush_interval=60, max_pending=3)
+    for i in range(3):
+        store.set(f"k{i}", i)
+    assert wait_for(lambda: len(client) == 3)
+    store.close()
+
+
+def test_redis_store_close_flushes_pending_writes():
+    client = InMemoryRedis()
+    store = RedisStore(client, prefix="t:", flush_interval=60)
+    store.set("a", 1)
+    store.close()
+    assert client.get("t:a") == b"1"
+
+
+def test_failed_flush_keeps_batch_without_overwriting_newer_writes():
+    class FlakyRedis(InMemoryRedis):
+        fail = True
+
+        def pipeline(self):
+            pipe = super().pipeline()
+            if self.fail:
+                self.fail = False
+                pipe.execute = lambda: (_ for _ in ()).throw(ConnectionError("busy"))
+            return pipe
+
+    client = FlakyRedis()
+    metrics = Metrics()
+    store = RedisStore(client, prefix="t:", flush_interval=60, metrics=metrics)
+    store.set("a", "old")
+    store.set("b", 1)
+    with pytest.raises(ConnectionError):
+        store.flush()
+    store.set("a", "new")
+    assert store.stats()["pending"] == 2
+
+    store.flush()
+    assert client.get("t:a") == b'"new"'
+    assert client.get("t:b") == b"1"
+    store.close()
+
+
+# -- SQLiteStore -----------------------------------------------------------
+
+def test_sqlite_store_ttl_and_eviction(tmp_path):
+    metrics = Metrics()
+    store = SQLiteStore(str(tmp_path / "kv.db"), max_entries=3, write_behind=False, metrics=metrics)
+    for i in range(5):
+        store.set(f"k{i}", i)
+    assert [store.get(f"k{i}") for i in range(5)] == [None, None, 2, 3, 4]
+    assert metrics.counter("store.evictions") == 2
+
+    store.set("short", 1, ttl=0.05)
+    time.sleep(0.1)
+    assert store.get("short") is None
+    store.close()
+
+
+def _write_from_child(store):
+    store.set("child", "hello")
+    store.flush()
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+def test_sqlite_store_created_before_fork(tmp_path):
+    store = SQLiteStore(str(tmp_path / "kv.db"), flush_interval=60)
+    store.set("parent", 1)
+    process = multiprocessing.get_context("fork").Process(target=_write_from_child, args=(store,))
+    process.start()
+    process.join(10)
+    assert process.exitcode == 0
+    store.flush()
+    assert store.get("child") == "hello"
+    assert store.get("parent") == 1
+    store.close()
+
+
+def test_sqlite_reads_do_not_wait_for_a_flush_in_progress(tmp_path):
+    store = SQLiteStore(str(tmp_path / "kv.db"), write_behind=False)
+    store.set("a", 1)
+    result = []
+    with store._connection() as conn:  # Held by a flush, like the flusher thread
+        conn.execute("BEGIN IMMEDIATE")
+        reader = threading.Thread(target=lambda: result.append(store.get("a")), daemon=True)
+        reader.start()
+        reader.join(2)
+        conn.execute("ROLLBACK")
+    assert result == [1]
+    store.close()
+
+
+# -- SharedMemoryStore -----------------------------------------------------
+
+@pytest.fixture
+def shm_store():
+    stores = []
+
+    def make(**kwargs):
+        kwargs.setdefault("write_behind", False)
+        store = SharedMemoryStore(kwargs.pop("name", None) or f"asb-test-{uuid.uuid4().hex[:8]}", **kwargs)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in reversed(stores):
+        store.close()
+    if stores:
+        stores[0].unlink()
+
+
+def colliding_keys(slots, count):
+    """Keys that all start probing at the same slot"""
+    keys, start = [], None
+    for i in range(10_000):
+        key = f"k{i}"
+        slot = SharedMemoryStore._hash(key.encode()) % slots
+        if start is None:
+            start = slot
+        if slot == start:
+            keys.append(key)
+            if len(keys) == count:
+                return keys
+    raise AssertionError("no colliding keys found")
+
+
+def test_shared_memory_store_probes_past_collisions_and_tombstones(shm_store):
+    store = shm_store(slots=8, max_probe=4)
+    a, b, c = colliding_keys(8, 3)
+    store.set(a, 1)
+    store.set(b, 2)
+    store.delete(a)
+    assert store.get(a) is None
+    assert store.get(b) == 2  # Found past the tombstone
+    store.set(c, 3)  # Reuses the tombstone
+    store.set(b, 20)  # Updates in place instead of adding a second copy
+    assert [store.get(k) for k in (a, b, c)] == [None, 20, 3]
+
+
+def test_shared_memory_store_evicts_oldest_in_full_probe_window(shm_store):
+    metrics = Metrics()
+    store = shm_store(slots=8, max_probe=2, metrics=metrics)
+    a, b, c = colliding_keys(8, 3)
+    store.set(a, 1)
+    store.set(b, 2)
+    store.set(c, 3)
+    assert [store.get(k) for k in (a, b, c)] == [None, 2, 3]
+    assert metrics.counter("store.evictions") == 1
+
+
+def test_shared_memory_store_ttl_and_oversized_values(shm_store):
+    metrics = Metrics()
+    store = shm_store(slot_size=128, metrics=metrics)
+    store.set("short", 1, ttl=0.05)
+    store.set("big", "x" * 200)
+    assert store.get("short") == 1
+    assert store.get("big") is None
+    assert metrics.counter("store.oversized") == 1
+    time.sleep(0.1)
+    assert store.get("short") is None
+
+
+def test_shared_memory_store_attaches_by_name(shm_store):
+    first = shm_store(slots=16, slot_size=256)
+    first.set("shared", {"turns": 2})
+    second = shm_store(name=first.shm_name, slots=1024)
+    assert (second.slots, second.slot_size) == (16, 256)  # Taken from the segment
+    assert second.get("shared") == {"turns": 2}
+    second.delete("shared")
+    assert first.get("shared") is None
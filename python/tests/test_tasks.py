@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+
+from agent_state_bridge.metrics import Metrics
+from agent_state_bridge.tasks import BackgroundQueue
+
+
+def test_runs_sync_and_async_jobs():
+    async def main():
+        metrics = Metrics()
+        queue = BackgroundQueue(workers=2, metrics=metrics)
+        done = []
+
+        async def save(x):
+            done.append(("async", x))
+
+        await queue.submit(save, 1)
+        await queue.submit(done.append, ("sync", 2))
+        await queue.drain()
+        return sorted(done), metrics.counter("tasks.completed")
+
+    assert asyncio.run(main()) == ([("async", 1), ("sync", 2)], 2)
+
+
+def test_drop_policy_discards_jobs_when_full():
+    async def main():
+        metrics = Metrics()
+        queue = BackgroundQueue(maxsize=1, workers=1, policy="drop", metrics=metrics)
+        release = asyncio.Event()
+        await queue.submit(release.wait)
+        await asyncio.sleep(0)  # The worker picks up the first job
+        accepted = [await queue.submit(asyncio.sleep, 0) for _ in range(3)]
+        release.set()
+        await queue.drain()
+        return accepted, metrics.counter("tasks.dropped")
+
+    assert asyncio.run(main()) == ([True, False, False], 2)
+
+
+def test_block_policy_waits_for_room():
+    async def main():
+        queue = BackgroundQueue(maxsize=1, workers=1, policy="block")
+        release = asyncio.Event()
+        await queue.submit(release.wait)
+        await asyncio.sleep(0)
+        await queue.submit(asyncio.sleep, 0)  # Fills the queue
+        blocked = asyncio.ensure_future(queue.submit(asyncio.sleep, 0))
+        await asyncio.sleep(0.01)
+        was_blocked = not blocked.done()
+        release.set()
+        accepted = await asyncio.wait_for(blocked, 1)
+        await queue.drain()
+        return was_blocked, accepted
+
+    assert asyncio.run(main()) == (True, True)
+
+
+def test_failed_jobs_are_counted_and_do_not_stop_workers():
+    async def main():
+        metrics = Metrics()
+        queue = BackgroundQueue(workers=1, metrics=metrics)
+        done = []
+
+        def boom():
+            raise RuntimeError("boom")
+
+        await queue.submit(boom)
+        await queue.submit(done.append, 1)
+        await queue.drain()
+        return done, metrics.counter("tasks.failed"), metrics.counter("tasks.completed")
+
+    assert asyncio.run(main()) == ([1], 1, 1)
+
+
+def test_drain_timeout_drops_remaining_jobs():
+    async def main():
+        metrics = Metrics()
+        queue = BackgroundQueue(workers=1, metrics=metrics)
+        await queue.submit(asyncio.sleep, 10)
+        await queue.submit(asyncio.sleep, 0)
+        await asyncio.sleep(0)
+        await queue.drain(timeout=0.01)
+        return queue.depth, metrics.counter("tasks.dropped")
+
+    assert asyncio.run(main()) == (0, 1)
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        BackgroundQueue(policy="later")
+
+
+# -- defer() through the FastAPI router -------------------------------------
+
+fastapi = pytest.importorskip("fastapi")
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agent_state_bridge.dispatch import FanOut, Hedge, Race
+from agent_state_bridge.fastapi import create_agent_router
+from agent_state_bridge.models import AgentResponse
+from agent_state_bridge.runtime import defer
+
+
+def chat(handler, policy=None):
+    """POST one message and return the response once deferred jobs have run"""
+    queue = BackgroundQueue()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await queue.drain(timeout=5)
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(create_agent_router(handler, policy=policy, task_queue=queue))
+    with TestClient(app, raise_server_exceptions=False) as client:
+        return client.post("/chat", json={"messages": [{"role": "user", "content": "hi"}]})
+
+
+def backends(saved):
+    async def fast(messages, actions, context):
+        await asyncio.sleep(0.01)
+        defer(saved.append, "fast")
+        return AgentResponse(response="fast")
+
+    async def slow(messages, actions, context):
+        defer(saved.append, "slow")
+        await asyncio.sleep(0.3)
+        return AgentResponse(response="slow")
+
+    return {"fast": fast, "slow": slow}
+
+
+@pytest.mark.parametrize("policy", [Race(), Hedge(delay=0.001)])
+def test_only_the_winners_deferred_jobs_run(policy):
+    saved = []
+    res = chat(backends(saved), policy)
+    assert res.json()["response"] == "fast"
+    assert saved == ["fast"]
+
+
+def test_fan_out_keeps_jobs_of_every_merged_backend():
+    saved = []
+    assert chat(backends(saved), FanOut()).status_code == 200
+    assert sorted(saved) == ["fast", "slow"]
+
+
+def test_fan_out_drops_jobs_of_backends_that_time_out():
+    saved = []
+    assert chat(backends(saved), FanOut(timeout=0.1)).status_code == 200
+    assert saved == ["fast"]
+
+
+def test_deferred_jobs_are_discarded_when_the_handler_fails():
+    saved = []
+
+    async def agent(messages, actions, context):
+        defer(saved.append, "save")
+        raise RuntimeError("boom")
+
+    assert chat(agent).status_code == 500
+    assert saved == []
@@ -0,0 +1,34 @@
+import pytest
+
+from agent_state_bridge import wire
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, False),
+        ("*/*", False),
+        ("application/msgpack", True),
+        ("application/json, application/msgpack", False),
+        ("application/json;q=0.5, application/msgpack", True),
+        ("application/msgpack;q=0", False),
+        ("application/x-msgpack;q=0.9, */*;q=0.8", True),
+    ],
+)
+def test_accepts_msgpack(accept, expected):
+    assert wire.accepts_msgpack(accept) is expected
+
+
+def test_is_msgpack():
+    assert wire.is_msgpack("application/msgpack; charset=binary")
+    assert wire.is_msgpack("Application/Vnd.Msgpack")
+    assert not wire.is_msgpack("application/json")
+    assert not wire.is_msgpack(None)
+
+
+def test_round_trip_and_invalid_body():
+    pytest.importorskip("msgpack")
+    data = {"messages": [{"role": "user", "content": "hola"}], "context": {"n": 1.5}}
+    assert wire.unpackb(wire.packb(data)) == data
+    with pytest.raises(ValueError):
+        wire.unpackb(b"\x92\x01")
@@ -11,6 +11,43 @@ export interface AgentAction {
   payload?: Record<string, any>;
 }
 
+/**
+ * Encodes request bodies and decodes responses for `/chat`.
+ * Defaults to JSON; see `createMsgpackCodec` for MessagePack.
+ */
+export interface AgentChatCodec {
+  contentType: string;
+  encode: (body: unknown) => BodyInit;
+  decode: (res: Response) => Promise<any>;
+}
+
+export const jsonCodec: AgentChatCodec = {
+  contentType: "application/json",
+  encode: (body) => JSON.stringify(body),
+  decode: (res) => res.json(),
+};
+
+/**
+ * MessagePack codec built from any msgpack implementation, e.g.
+ * `createMsgpackCodec(encode, decode)` with `@msgpack/msgpack`.
+ * Responses the server sent as JSON are still decoded as JSON.
+ */
+export function createMsgpackCodec(
+  encode: (value: unknown) => Uint8Array,
+  decode: (data: Uint8Array) => unknown
+): AgentChatCodec {
+  return {
+    contentType: "application/msgpack",
+    encode: (body) => encode(body) as BodyInit,
+    decode: async (res) => {
+      if (res.headers.get("Content-Type")?.includes("json")) {
+        return res.json();
+      }
+      return decode(new Uint8Array(await res.arrayBuffer()));
+    },
+  };
+}
+
 export interface AgentChatOptions<Context = any> {
   endpoint?: string;
   initialMessages?: AgentChatMessage[];
@@ -18,6 +55,7 @@ export interface AgentChatOptions<Context = any> {
   getActions?: () => AgentAction[];
   onActionsReceived?: (actions: AgentAction[]) => void;
   onContextUpdated?: (context: Context) => void;
+  codec?: AgentChatCodec;
 }
 
 export function useAgentChat<Context = any>({
@@ -27,6 +65,7 @@ export function useAgentChat<Context = any>({
   getActions = () => [],
   onActionsReceived,
   onContextUpdated,
+  codec = jsonCodec,
 }: AgentChatOptions<Context>) {
   const [messages, setMessages] = useState<AgentChatMessage[]>(initialMessages);
   const [loading, setLoading] = useState(false);
@@ -48,8 +87,8 @@ export function useAgentChat<Context = any>({
     try {
       const res = await fetch(endpoint, {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
+        headers: { "Content-Type": codec.contentType, Accept: codec.contentType },
+        body: codec.encode({
           messages: updatedMessages.map(m => ({ role: m.role, content: m.content })),
           actions: getActions(),
           context: getContext(),
@@ -60,7 +99,7 @@ export function useAgentChat<Context = any>({
         throw new Error(`HTTP ${res.status}: ${res.statusText}`);
       }
       
-      const data = await res.json();
+      const data = await codec.decode(res);
       
       // Add assistant response
       setMessages((prev) => [